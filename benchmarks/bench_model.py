@@ -0,0 +1,213 @@
+"""GoalModel 性能基准（无需图形界面）
+
+用法：
+    python benchmarks/bench_model.py                      # 默认 100、10k、100k 个目标
+    python benchmarks/bench_model.py --sizes 100 10000    # 指定规模
+    python benchmarks/bench_model.py --label 1.0.6        # 为本次结果打标签（如版本号）
+
+每次运行的结果追加到 benchmarks/results.json，并与上一次记录逐项对比，
+变慢超过阈值的项目会标出，便于发现版本之间的性能回退。
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results.json')
+CATEGORIES = ['weekly', 'monthly', 'yearly']
+TOGGLE_COUNT = 1000  # 每个规模下单条修改类操作的执行次数
+
+
+def make_goals(size, seed=0):
+    """生成 size 个目标，分布在三个分类中"""
+    rng = random.Random(seed)
+    goals = {category: [] for category in CATEGORIES}
+    for i in range(size):
+        goals[CATEGORIES[i % len(CATEGORIES)]].append(main.Goal(
+            f'{rng.randint(1, 9)}.目标{i}',
+            rng.random() < 0.3,
+            rng.choice(list(main.Priority))
+        ))
+    return goals
+
+
+def timed(func, repeat=1):
+    """执行 repeat 次，返回最快一次的耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(size, workdir):
+    """在给定规模下执行所有基准，返回 {名称: 秒}"""
+    results = {}
+    repeat = 5 if size <= 10000 else 1
+    goals = make_goals(size)
+    rng = random.Random(1)
+
+    # 整体 JSON 存储：保存与加载
+    json_path = os.path.join(workdir, f'json-{size}', 'goals.json')
+    os.makedirs(os.path.dirname(json_path))
+    storage = main.JsonStorage(json_path)
+    results['save_data.json'] = timed(lambda: storage.save(goals), repeat)
+    results['load_data.json'] = timed(lambda: main.GoalModel(main.JsonStorage(json_path)).load(), repeat)
+
+    # SQLite 存储：启动时只读取分类列表，首次显示当前分类时才读取该分类
+    sqlite_path = os.path.join(workdir, f'sqlite-{size}', 'goals.json')
+    os.makedirs(os.path.dirname(sqlite_path))
+    shutil.copy(json_path, sqlite_path)
+    main.SqliteStorage(sqlite_path).load()  # 迁移
+
+    def load_sqlite():
+        model = main.GoalModel(main.SqliteStorage(sqlite_path))
+        model.load()
+        model.goals['weekly']
+        model.close()
+    results['load_data.sqlite'] = timed(load_sqlite, repeat)
+
+    # 二进制快照：启动时只读取分类表，首次显示当前分类时才解码该分类
+    binary_path = os.path.join(workdir, f'binary-{size}', 'goals.json')
+    os.makedirs(os.path.dirname(binary_path))
+    shutil.copy(json_path, binary_path)
+    main.BinaryStorage(binary_path).load()  # 迁移
+
+    def load_binary():
+        model = main.GoalModel(main.BinaryStorage(binary_path))
+        model.load()
+        model.goals['weekly']
+        model.close()
+    results['load_data.binary'] = timed(load_binary, repeat)
+
+    # 排序：建立有序索引，以及单条修改后的增量移动
+    weekly = goals['weekly']
+    results['sort.build'] = timed(lambda: main.SortedGoalIndex(weekly), repeat)
+    index = main.SortedGoalIndex(weekly)
+    picks = [rng.choice(weekly) for _ in range(TOGGLE_COUNT)]
+
+    def move_all():
+        for goal in picks:
+            old_key = main.goal_sort_key(goal)
+            goal.completed = not goal.completed
+            index.move(goal, old_key)
+    results['sort.move_per_op'] = timed(move_all) / TOGGLE_COUNT
+
+    # 进度统计：首次统计与之后的读取
+    model = main.GoalModel(main.JsonStorage(json_path))
+    model.goals = goals
+    results['stats.count'] = timed(lambda: main.GoalCounters(model.storage.count_groups(goals, 'weekly')),
+                                   repeat)
+    model.todo_count()
+    results['stats.read_per_op'] = timed(
+        lambda: [model.progress('weekly') for _ in range(TOGGLE_COUNT)]) / TOGGLE_COUNT
+    results['stats.todo_count'] = timed(model.todo_count, repeat)
+
+    # 全文搜索：建立双字索引，以及每次按键的一次查询
+    results['search.build'] = timed(
+        lambda: main.GoalSearchIndex((c, g) for c in CATEGORIES for g in goals[c]), repeat)
+    search = main.GoalSearchIndex((c, g) for c in CATEGORIES for g in goals[c])
+    queries = [f'目标{rng.randint(0, size)}'[:rng.randint(2, 5)] for _ in range(TOGGLE_COUNT)]
+    results['search.query_per_op'] = timed(
+        lambda: [search.search(query) for query in queries]) / TOGGLE_COUNT
+
+    # 批量添加、导入与勾选：走数据模型和日志存储的完整路径
+    journal_path = os.path.join(workdir, f'journal-{size}', 'goals.json')
+    os.makedirs(os.path.dirname(journal_path))
+    storage = main.JournalStorage(journal_path)
+    model = main.GoalModel(storage)
+    model.goals = storage.load() or {category: [] for category in CATEGORIES}
+    for category in CATEGORIES:
+        model.goals.setdefault(category, [])
+        model.sorted_index(category)
+        model.goal_counters(category)
+    source = make_goals(size, seed=2)
+
+    def bulk_add():
+        for category in CATEGORIES:
+            for goal in source[category]:
+                model.add_goal(category, main.Goal(goal.text, goal.completed, goal.priority))
+    results['bulk_add.total'] = timed(bulk_add)
+    # 导入走批量路径：整体保存一次
+    results['bulk_import.total'] = timed(
+        lambda: model.add_goals((category, main.Goal(goal.text, goal.completed, goal.priority))
+                                for category in CATEGORIES
+                                for goal in source[category]))
+    toggles = [rng.choice(model.goals['weekly']) for _ in range(TOGGLE_COUNT)]
+
+    def bulk_toggle():
+        for goal in toggles:
+            model.update_goal('weekly', goal, completed=not goal.completed)
+    results['bulk_toggle.per_op'] = timed(bulk_toggle) / TOGGLE_COUNT
+    storage.close()
+    return results
+
+
+def load_history():
+    """读取历史结果"""
+    if not os.path.exists(RESULTS_FILE):
+        return []
+    with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def report(results, previous, threshold):
+    """打印本次结果，并与上一次记录对比"""
+    print(f'{"基准":<32}{"本次":>12}{"上次":>12}{"变化":>10}')
+    for name, seconds in results.items():
+        line = f'{name:<32}{seconds * 1000:>10.3f}ms'
+        old = previous.get(name) if previous else None
+        if old:
+            change = (seconds - old) / old * 100
+            flag = '  <-- 变慢' if change > threshold else ''
+            line += f'{old * 1000:>10.3f}ms{change:>+9.1f}%{flag}'
+        print(line)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='GoalModel 性能基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000])
+    parser.add_argument('--label', default=datetime.now().strftime('%Y-%m-%d %H:%M'))
+    parser.add_argument('--threshold', type=float, default=20.0, help='标记为变慢的百分比阈值')
+    parser.add_argument('--no-record', action='store_true', help='不写入 results.json')
+    args = parser.parse_args()
+
+    logging.getLogger('GoalTracker').setLevel(logging.WARNING)
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='mytarget-bench-')
+    try:
+        for size in args.sizes:
+            for name, seconds in bench_size(size, workdir).items():
+                results[f'{name}[{size}]'] = seconds
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    history = load_history()
+    report(results, history[-1]['results'] if history else None, args.threshold)
+    if not args.no_record:
+        history.append({
+            'label': args.label,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results
+        })
+        with open(RESULTS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main_cli()
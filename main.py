@@ -1,36 +1,140 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import json
 import os
 import sys
 from datetime import datetime, timedelta
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import atexit
 import random
 import time
+import bisect
+import threading
+import sqlite3
+import mmap
+import struct
+import heapq
+import itertools
+import math
+import functools
+import collections
+import cProfile
+import csv
+import hashlib
+import contextlib
+import enum
+import array
+import shutil
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        logging.StreamHandler(),  # 输出到控制台
-        logging.FileHandler('app.log', encoding='utf-8')  # 同时保存到文件
-    ]
-)
+# 进程启动（模块导入）时间，启动耗时报告以此为起点
+PROCESS_START = time.perf_counter()
+
+# 配置日志：界面线程只把日志记录放进队列，由后台线程写控制台和文件；
+# app.log 按大小轮转。每次操作的开始/成功记录是 DEBUG 级别，
+# 可通过环境变量 MYTARGET_LOG_LEVEL 或 settings.json 中的 "log_level" 打开
+LOG_FILE = 'app.log'
+LOG_MAX_BYTES = 1024 * 1024  # 单个日志文件上限
+LOG_BACKUP_COUNT = 3  # 保留的历史日志文件数
+
+log_queue = queue.Queue(-1)
+log_file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                       backupCount=LOG_BACKUP_COUNT,
+                                       encoding='utf-8', delay=True)
+log_file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s',
+                                                datefmt='%Y-%m-%d %H:%M:%S'))
+log_console_handler = logging.StreamHandler()  # 输出到控制台
+log_console_handler.setFormatter(log_file_handler.formatter)
+log_listener = QueueListener(log_queue, log_console_handler, log_file_handler)
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # 只合并参数，格式由后台处理器决定
+logging.basicConfig(level=logging.INFO, handlers=[log_queue_handler])
+log_listener.start()
+atexit.register(log_listener.stop)  # 退出时写完队列中剩余的日志
 logger = logging.getLogger('GoalTracker')
+if 'MYTARGET_LOG_LEVEL' in os.environ:
+    try:
+        logging.getLogger().setLevel(os.environ['MYTARGET_LOG_LEVEL'].upper())
+    except ValueError:
+        logger.warning(f'无效的日志级别: {os.environ["MYTARGET_LOG_LEVEL"]}，使用 INFO')
+
+class LatencyHistogram:
+    """对数分桶的耗时直方图：内存占用固定，分位数误差约 9%"""
+    BUCKETS_PER_DOUBLING = 8
+    MIN_SECONDS = 1e-6  # 小于 1 微秒的耗时计入第一个桶
+
+    def __init__(self):
+        self.buckets = {}  # 桶序号 -> 次数
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        """记录一次耗时"""
+        bucket = max(0, math.ceil(math.log2(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS)
+                                  * self.BUCKETS_PER_DOUBLING))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """返回第 q 分位（0~100）的耗时上界（秒）"""
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                upper = self.MIN_SECONDS * 2 ** (bucket / self.BUCKETS_PER_DOUBLING)
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self):
+        """汇总为可写入 JSON 的字典（毫秒）"""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0,
+            'min_ms': round((self.min or 0) * 1000, 3),
+            'p50_ms': round(self.percentile(50) * 1000, 3),
+            'p95_ms': round(self.percentile(95) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3)
+        }
+
+# 各操作的耗时直方图：操作名 -> LatencyHistogram
+operation_latency = {}
+# 正在执行的操作（嵌套调用时为调用栈）和最近完成的操作 (操作名, 开始, 结束)，供卡顿监视使用
+active_operations = []
+operation_trace = collections.deque(maxlen=256)
 
 def log_operation(func):
-    """操作日志装饰器"""
+    """操作日志装饰器（开始/成功为 DEBUG 级别，失败为 ERROR 级别），同时记录耗时"""
+    histogram = operation_latency.setdefault(func.__name__, LatencyHistogram())
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        active_operations.append(func.__name__)
         try:
-            logger.info(f'开始执行: {func.__name__}')
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f'开始执行: {func.__name__}')
             result = func(*args, **kwargs)
-            logger.info(f'执行成功: {func.__name__}')
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f'执行成功: {func.__name__}')
             return result
         except Exception as e:
             logger.error(f'执行失败: {func.__name__}, 错误: {str(e)}', exc_info=True)
             raise
+        finally:
+            end = time.perf_counter()
+            active_operations.pop()
+            operation_trace.append((func.__name__, start, end))
+            histogram.record(end - start)
     return wrapper
 
 class Theme:
@@ -64,10 +168,39 @@ class Theme:
         'hover': '#2c3e50'
     }
 
+class ThemeRegistry:
+    """主题注册表：控件登记自己用到的 Theme 颜色角色，切换主题时一次性重新着色，不销毁任何控件"""
+    def __init__(self, theme):
+        self.theme = theme
+        self.entries = {}  # 控件路径名 -> (控件, {选项: 颜色角色})
+
+    def register(self, widget, **roles):
+        """登记控件的颜色选项（如 bg='bg', fg='fg'）并立即按当前主题着色，返回控件本身"""
+        name = str(widget)
+        if name in self.entries:
+            self.entries[name][1].update(roles)
+        else:
+            self.entries[name] = (widget, dict(roles))
+            widget.bind('<Destroy>', lambda e, name=name: self._forget(e, name), add='+')
+        widget.configure(**{option: self.theme[role] for option, role in roles.items()})
+        return widget
+
+    def _forget(self, event, name):
+        """控件销毁后移除登记（子控件的销毁事件也会传到这里，只处理自身）"""
+        if str(event.widget) == name:
+            self.entries.pop(name, None)
+
+    def apply(self, theme):
+        """切换到新的配色：对所有登记的控件各调用一次 configure"""
+        self.theme = theme
+        for widget, roles in list(self.entries.values()):
+            widget.configure(**{option: theme[role] for option, role in roles.items()})
+
 class Language:
-    def __init__(self):
+    def __init__(self, languages=None):
         self.current_lang = 'zh_CN'
-        self.languages = self.load_languages()
+        # 传入 languages 时不读文件（启动时由后台线程读取后再填入）
+        self.languages = self.load_languages() if languages is None else languages
     
     def load_languages(self):
         """加载语言文件"""
@@ -85,24 +218,2183 @@ class Language:
     def get_text(self, key, *args):
         """获取指定语言的文本"""
         try:
-            text = self.languages[self.current_lang]
-            for k in key.split('.'):
-                text = text[k]
-            return text.format(*args) if args else text
-        except:
-            return key
-    
-    def toggle_language(self):
-        """切换语言"""
-        self.current_lang = 'en_US' if self.current_lang == 'zh_CN' else 'zh_CN'
-        return self.current_lang
+            text = self.languages[self.current_lang]
+            for k in key.split('.'):
+                text = text[k]
+            return text.format(*args) if args else text
+        except:
+            return key
+    
+    def toggle_language(self):
+        """切换语言"""
+        self.current_lang = 'en_US' if self.current_lang == 'zh_CN' else 'zh_CN'
+        return self.current_lang
+
+class Priority(enum.IntEnum):
+    """优先级：数值即排序（高>中>低），比较时就是整数比较；label 为 goals.json 中的写法"""
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+
+    @property
+    def label(self):
+        return self.name.lower()
+
+    @classmethod
+    def parse(cls, value):
+        """从 'high'/'medium'/'low'（不区分大小写）或 Priority 转换，无法识别时抛出 ValueError"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls[str(value).strip().upper()]
+        except KeyError:
+            raise ValueError(f'未知的优先级: {value}') from None
+
+class Goal:
+    """一个目标：字段放在 __slots__ 中，比字典省内存；id 写入 goals.json，跨运行保持不变
+
+    与 goals.json 中的字典无损互转：未知的键原样保存在 extra 中，写回时一并写出。
+    """
+    __slots__ = ('id', 'text', 'completed', 'priority', 'extra')
+    FIELDS = ('text', 'completed', 'priority')
+    last_id = 0  # 已分配或读到的最大 id，新目标的 id 从它之后分配
+
+    def __init__(self, text, completed=False, priority=Priority.LOW, id=None, extra=None):
+        if id is None:
+            id = Goal.next_id()
+        elif id > Goal.last_id:
+            Goal.last_id = id
+        self.id = id
+        self.text = text
+        self.completed = completed
+        self.priority = priority
+        self.extra = extra
+
+    @staticmethod
+    def next_id():
+        """分配一个新的 id"""
+        Goal.last_id += 1
+        return Goal.last_id
+
+    @classmethod
+    def from_dict(cls, data):
+        """从 goals.json 中的字典创建，字段不合法时抛出 ValueError"""
+        if not isinstance(data, dict):
+            raise ValueError('不是对象')
+        text = data.get('text')
+        if not isinstance(text, str):
+            raise ValueError('目标内容不是文本')
+        goal_id = data.get('id')
+        if goal_id is not None and (not isinstance(goal_id, int) or isinstance(goal_id, bool)):
+            raise ValueError(f'无效的 id: {goal_id}')
+        extra = {key: value for key, value in data.items()
+                 if key not in cls.FIELDS and key != 'id'} or None
+        try:
+            priority = Priority.parse(data.get('priority', 'low'))
+        except ValueError:
+            # 旧版本的优先级是任意文本：按低优先级显示，原值放在 extra 中原样写回，直到用户修改优先级
+            priority = Priority.LOW
+            extra = dict(extra or {}, priority=data['priority'])
+        return cls(text, bool(data.get('completed', False)), priority, goal_id, extra)
+
+    def to_dict(self):
+        """转换为 goals.json 中的字典"""
+        data = {'text': self.text, 'completed': self.completed,
+                'priority': self.priority.label, 'id': self.id}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self):
+        """内容和 id 都相同的副本"""
+        return Goal(self.text, self.completed, self.priority, self.id, self.extra)
+
+    def __repr__(self):
+        return f'Goal({self.id}, {self.text!r}, {self.completed}, {self.priority.label})'
+
+def goals_from_json(data):
+    """goals.json 的数据（分类 -> 目标字典列表）转换为 Goal 对象；旧文件没有 id 时分配新的，
+    重复的 id（如手动复制了一行）也重新分配"""
+    goals = {}
+    seen = set()
+    for category, items in data.items():
+        category_goals = goals[category] = []
+        for item in items:
+            goal = Goal.from_dict(item)
+            if goal.id in seen:
+                goal.id = Goal.next_id()
+            seen.add(goal.id)
+            category_goals.append(goal)
+    return goals
+
+def goals_to_json(goals):
+    """Goal 对象转换为 goals.json 的数据"""
+    return {category: [goal.to_dict() for goal in items] for category, items in goals.items()}
+
+PRIORITY_ICONS = {Priority.HIGH: '🔴', Priority.MEDIUM: '🟡', Priority.LOW: '🟢'}
+
+def encode_fields(fields):
+    """变更记录中的字段值转换为 JSON 可写的形式（优先级写名称）"""
+    return {field: value.label if isinstance(value, Priority) else value
+            for field, value in fields.items()}
+
+def apply_operation(goals, op, by_id=None):
+    """把一条变更记录应用到目标数据上（日志回放使用）
+
+    修改和删除按目标 id 定位（旧版本的记录按位置）；by_id 是 {分类: {id: 目标}} 的缓存，
+    回放整个日志时传入同一个字典，每个分类只建立一次。
+    """
+    if by_id is None:
+        by_id = {}
+    category = op['category']
+    category_goals = goals.setdefault(category, [])
+    if op['op'] in ('update', 'remove') and 'id' in op and category not in by_id:
+        by_id[category] = {goal.get('id'): goal for goal in category_goals}
+    if op['op'] == 'add':
+        category_goals.insert(op.get('index', len(category_goals)), op['goal'])
+        if category in by_id:
+            by_id[category][op['goal'].get('id')] = op['goal']
+    elif op['op'] == 'update':
+        goal = by_id[category][op['id']] if 'id' in op else category_goals[op['index']]
+        goal.update(op['fields'])
+    elif op['op'] == 'remove':
+        if 'id' in op:
+            category_goals.remove(by_id[category].pop(op['id']))
+        else:
+            goal = category_goals.pop(op['index'])
+            by_id.get(category, {}).pop(goal.get('id'), None)
+    elif op['op'] == 'remove_category':
+        del goals[category]
+        by_id.pop(category, None)
+    elif op['op'] != 'add_category':
+        raise ValueError(f'未知的变更类型: {op["op"]}')
+
+class WriteConflictError(Exception):
+    """数据文件在上次读取或写入之后被其他程序修改过，写入会覆盖这些修改"""
+
+class JsonStorage:
+    """整体存储：每次保存整体重写 goals.json"""
+    # 是否监视其他程序对数据文件的修改（日志和 SQLite 存储的 goals.json 不是唯一数据来源）
+    LIVE_RELOAD = True
+
+    def __init__(self, path):
+        self.path = path
+        # 修改目标数据时持有，后台线程读取数据时也持有
+        self.lock = threading.RLock()
+        # 最近一次读写时的 (修改时间, 大小)，以及本程序读到或写入过的内容哈希
+        self.disk_stat = None
+        self.known_digests = collections.deque(maxlen=8)
+        # 与磁盘内容一致的最近一份数据（独立副本），合并外部修改时作为共同基准
+        self.base = None
+
+    def load(self):
+        """读取快照，文件不存在时返回 None"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        self.remember(raw, os.stat(self.path))
+        goals = json.loads(raw)
+        if self.LIVE_RELOAD:
+            self.base = goals_from_json(goals)
+        return goals
+
+    def save(self, goals):
+        """整体写入快照：先写临时文件再原子替换，写到一半崩溃也不会损坏原文件"""
+        raw = json.dumps(goals, ensure_ascii=False, indent=2, default=Goal.to_dict).encode('utf-8')
+        if self.LIVE_RELOAD and self.external_change() is not None:
+            raise WriteConflictError(f'{self.path} 已被其他程序修改，暂不写入')
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        # 替换前记下内容哈希，替换后定时检查时不会把自己的写入当成外部修改
+        self.remember(raw, os.stat(tmp_path))
+        os.replace(tmp_path, self.path)
+        if self.LIVE_RELOAD:
+            self.base = {category: [goal.copy() for goal in category_goals]
+                         for category, category_goals in goals.items()}
+
+    def remember(self, raw, stat):
+        """记录本程序读到或写入的文件内容"""
+        self.known_digests.append(hashlib.sha1(raw).hexdigest())
+        self.disk_stat = (stat.st_mtime_ns, stat.st_size)
+
+    def external_change(self):
+        """检查数据文件是否被其他程序修改：修改时间和大小都没变时不读文件，
+        变了再比较内容哈希（本程序写入的内容不算）。返回修改后的文件内容，没有外部修改时返回 None"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        if (stat.st_mtime_ns, stat.st_size) == self.disk_stat:
+            return None
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        if hashlib.sha1(raw).hexdigest() in self.known_digests:
+            self.disk_stat = (stat.st_mtime_ns, stat.st_size)
+            return None
+        return raw
+
+    def accept_external(self, raw, goals):
+        """外部修改已合并：把它作为新的基准（goals 为 raw 解析出的数据，之后不再修改）"""
+        self.known_digests.append(hashlib.sha1(raw).hexdigest())
+        # 文件可能在合并期间再次被修改，下次检查时重新比较哈希
+        self.disk_stat = None
+        self.base = goals
+
+    def record(self, goals, op):
+        """记录单条变更；整体存储模式下直接重写快照"""
+        self.save(goals)
+
+    def flush(self, goals):
+        """退出前确保数据已经写入磁盘"""
+        self.save(goals)
+
+    def count_groups(self, goals, category):
+        """按 (完成状态, 优先级) 分组统计分类的目标数量，用于初始化计数器"""
+        groups = {}
+        for goal in goals[category]:
+            group = (goal.completed, goal.priority)
+            groups[group] = groups.get(group, 0) + 1
+        return [(completed, priority, count) for (completed, priority), count in groups.items()]
+
+    def category_names(self, goals):
+        """所有分类名"""
+        return list(goals)
+
+    def close(self):
+        """释放存储占用的资源"""
+
+class JournalStorage(JsonStorage):
+    """日志存储：每次变更只追加一条记录，日志过大时在后台线程合并进快照
+
+    文件：goals.json（快照）、goals.journal（当前日志）、goals.journal.1（正在合并的日志）、
+    goals.json.compact（合并结果）。删除 goals.journal.1 是合并的提交点，
+    因此任何时刻崩溃都能在下次加载时恢复到一致状态。
+    """
+    COMPACT_THRESHOLD = 256 * 1024  # 日志超过该字节数后触发后台合并
+    LIVE_RELOAD = False
+
+    def __init__(self, path):
+        super().__init__(path)
+        base = os.path.splitext(path)[0]
+        self.journal_path = base + '.journal'
+        self.rotated_path = self.journal_path + '.1'
+        self.compact_path = path + '.compact'
+        self.journal = None
+        self.journal_size = 0
+        self.compactor = None
+
+    def load(self):
+        """读取快照并依次回放待合并日志和当前日志"""
+        self._recover()
+        self._repair_journals()
+        goals = super().load()
+        has_journal = os.path.exists(self.rotated_path) or os.path.exists(self.journal_path)
+        if goals is None and has_journal:
+            goals = {}
+        if goals is not None:
+            for path in (self.rotated_path, self.journal_path):
+                self._replay(goals, path)
+            ids = [goal.get('id') for category_goals in goals.values() for goal in category_goals]
+            if None in ids or len(set(ids)) != len(ids):
+                # 旧版本的数据没有 id（或 id 重复）：分配后整体写入一次，之后的日志记录按 id 引用目标
+                goals = goals_to_json(goals_from_json(goals))
+                self.save(goals)
+                return goals
+        self._open_journal()
+        # 上次退出时合并未完成，继续在后台合并
+        if os.path.exists(self.rotated_path):
+            self._start_compaction()
+        return goals
+
+    def save(self, goals):
+        """整体写入快照并清空日志"""
+        self._wait_compaction()
+        self._close_journal()
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.rotated_path):
+                # 上次合并失败遗留的日志：把当前日志接在后面，保持回放顺序
+                with open(self.journal_path, 'rb') as src, open(self.rotated_path, 'ab') as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.rotated_path)
+        self._write_compact(goals)
+        self._commit_compact()
+        self._open_journal()
+
+    def record(self, goals, op):
+        """追加一条变更记录，写入成本与数据总量无关"""
+        if self.journal is None:
+            self._open_journal()
+        line = json.dumps(op, ensure_ascii=False, default=Goal.to_dict) + '\n'
+        self.journal.write(line)
+        self.journal.flush()
+        self.journal_size += len(line.encode('utf-8'))
+        if (self.journal_size > self.COMPACT_THRESHOLD and not self._compacting()
+                and not os.path.exists(self.rotated_path)):
+            self._close_journal()
+            os.replace(self.journal_path, self.rotated_path)
+            self._open_journal()
+            self._start_compaction()
+
+    def flush(self, goals):
+        """每条变更都已追加到日志，退出时无需重写快照"""
+
+    def close(self):
+        """等待后台合并结束并关闭日志文件"""
+        self._wait_compaction()
+        self._close_journal()
+
+    def _open_journal(self):
+        """以追加模式打开当前日志"""
+        self.journal = open(self.journal_path, 'a', encoding='utf-8')
+        self.journal_size = self.journal.tell()
+
+    def _close_journal(self):
+        """关闭当前日志"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def _replay(self, goals, path):
+        """回放一个日志文件"""
+        self._apply(goals, self._operations(path))
+
+    def _apply(self, goals, ops):
+        """依次应用变更记录，跳过与数据对不上的记录（如引用了不存在的目标）"""
+        by_id = {}
+        for op in ops:
+            try:
+                if op['op'] == 'add':
+                    Goal.from_dict(op['goal'])  # 只检查目标能否读取，无法读取的不加入
+                apply_operation(goals, op, by_id)
+            except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+                logger.warning(f'忽略无法应用的日志记录: {op!r} ({e!r})')
+
+    def _operations(self, path):
+        """依次读出一个日志文件中的变更记录，跳过无法解析的行，忽略崩溃时写了一半的最后一行"""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    logger.warning(f'忽略不完整的日志记录: {path}:{line_no}')
+                    break
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    op = None
+                if not isinstance(op, dict) or not isinstance(op.get('op'), str) \
+                        or not isinstance(op.get('category'), str):
+                    logger.warning(f'忽略无法解析的日志记录: {path}:{line_no}: {line[:200]!r}')
+                    continue
+                yield op
+
+    def _repair_journals(self):
+        """截掉崩溃时写了一半的最后一行：之后追加的记录否则会接在残片后面，成为一行无法解析的记录"""
+        for path in (self.rotated_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r+b') as f:
+                end = position = f.seek(0, os.SEEK_END)
+                good = 0
+                while position > 0:
+                    start = max(0, position - 65536)
+                    f.seek(start)
+                    newline = f.read(position - start).rfind(b'\n')
+                    if newline >= 0:
+                        good = start + newline + 1
+                        break
+                    position = start
+                if good < end:
+                    logger.warning(f'截掉不完整的日志记录: {path}（{end - good} 字节）')
+                    f.truncate(good)
+
+    def _recover(self):
+        """处理上次合并中断留下的文件"""
+        if os.path.exists(self.compact_path):
+            if os.path.exists(self.rotated_path):
+                os.remove(self.compact_path)  # 合并未提交，丢弃结果
+            else:
+                os.replace(self.compact_path, self.path)  # 合并已提交，完成替换
+
+    def _write_compact(self, goals):
+        """把合并结果写入临时快照并落盘"""
+        with open(self.compact_path, 'w', encoding='utf-8') as f:
+            json.dump(goals, f, ensure_ascii=False, indent=2, default=Goal.to_dict)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _commit_compact(self):
+        """删除已合并的日志（提交点），再替换快照"""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+        os.replace(self.compact_path, self.path)
+
+    def _compacting(self):
+        """是否有后台合并正在进行"""
+        return self.compactor is not None and self.compactor.is_alive()
+
+    def _start_compaction(self):
+        """启动后台合并线程"""
+        self.compactor = threading.Thread(target=self._compact, name='journal-compactor',
+                                          daemon=True)
+        self.compactor.start()
+
+    def _wait_compaction(self):
+        """等待后台合并结束"""
+        if self.compactor is not None:
+            self.compactor.join()
+            self.compactor = None
+
+    def _compact(self):
+        """后台线程：从磁盘读取快照并回放已轮转的日志，生成新快照"""
+        try:
+            goals = JsonStorage.load(self) or {}
+            self._replay(goals, self.rotated_path)
+            self._write_compact(goals)
+            self._commit_compact()
+            logger.info('日志合并完成')
+        except Exception as e:
+            logger.error(f'日志合并失败: {str(e)}', exc_info=True)
+
+class LazyGoals(dict):
+    """按需加载的目标数据：某个分类首次被访问时才从存储中读取"""
+    def __init__(self, loader, categories):
+        super().__init__()
+        self.loader = loader
+        self.categories = list(categories)
+
+    def __missing__(self, category):
+        goals = self.loader(category)
+        self[category] = goals
+        if category not in self.categories:
+            self.categories.append(category)
+        return goals
+
+    def __bool__(self):
+        return bool(self.categories)
+
+class SqliteStorage(JsonStorage):
+    """SQLite 存储：每次变更是一个单行事务，分类在首次访问时才读取
+
+    索引 (category, completed, priority_rank, text) 与列表排序键一致，
+    分类按显示顺序读出，统计数量也直接走索引。
+    """
+    LIVE_RELOAD = False
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS categories (
+            name TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            text TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            priority TEXT NOT NULL,
+            priority_rank INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_goals_order
+            ON goals (category, completed, priority_rank, text);
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.db_path = os.path.splitext(path)[0] + '.db'
+        self.conn = None
+        self.rowids = {}  # goal_key -> 数据库行号
+
+    def load(self):
+        """只读取分类列表，目标在分类首次被访问时再读取"""
+        is_new = not os.path.exists(self.db_path)
+        # 启动时在后台线程中打开，之后由界面线程使用（同一时间只有一个线程访问）
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.executescript(self.SCHEMA)
+        if is_new and os.path.exists(self.path):
+            # 首次启用时从 goals.json 迁移
+            logger.info('从 JSON 文件迁移数据到 SQLite')
+            self.save(goals_from_json(JsonStorage.load(self) or {}))
+        categories = [row[0] for row in self.conn.execute('SELECT name FROM categories ORDER BY rowid')]
+        if not categories:
+            return None
+        return LazyGoals(self._load_category, categories)
+
+    def _load_category(self, category):
+        """按显示顺序读取一个分类的目标"""
+        goals = []
+        rows = self.conn.execute(
+            'SELECT id, text, completed, priority FROM goals WHERE category = ? '
+            'ORDER BY completed, priority_rank, text', (category,))
+        for rowid, text, completed, priority in rows:
+            goal = Goal(text, bool(completed), Priority.parse(priority))
+            self.rowids[goal_key(goal)] = rowid
+            goals.append(goal)
+        return goals
+
+    def save(self, goals):
+        """在一个事务中整体重写已加载的分类"""
+        if self.conn is None:
+            self.load()
+        with self.conn:
+            for category, category_goals in goals.items():
+                self.conn.execute('INSERT OR IGNORE INTO categories (name) VALUES (?)', (category,))
+                self.conn.execute('DELETE FROM goals WHERE category = ?', (category,))
+                for goal in category_goals:
+                    self.rowids[goal_key(goal)] = self._insert(category, goal)
+
+    def record(self, goals, op):
+        """每条变更一个单行事务"""
+        category = op['category']
+        with self.conn:
+            if op['op'] == 'add':
+                goal = op['goal']
+                self.rowids[goal_key(goal)] = self._insert(category, goal)
+            elif op['op'] == 'update':
+                fields = dict(op['fields'])
+                if 'priority' in fields:
+                    fields['priority_rank'] = int(Priority.parse(fields['priority']))
+                assignments = ', '.join(f'{name} = ?' for name in fields)
+                self.conn.execute(f'UPDATE goals SET {assignments} WHERE id = ?',
+                                  (*fields.values(), self.rowids[op['id']]))
+            elif op['op'] == 'remove':
+                rowid = self.rowids.pop(op['id'])
+                self.conn.execute('DELETE FROM goals WHERE id = ?', (rowid,))
+            elif op['op'] == 'add_category':
+                self.conn.execute('INSERT OR IGNORE INTO categories (name) VALUES (?)', (category,))
+            elif op['op'] == 'remove_category':
+                self.conn.execute('DELETE FROM goals WHERE category = ?', (category,))
+                self.conn.execute('DELETE FROM categories WHERE name = ?', (category,))
+
+    def count_groups(self, goals, category):
+        """用索引分组统计分类的目标数量，不需要加载该分类"""
+        rows = self.conn.execute(
+            'SELECT completed, priority, COUNT(*) FROM goals WHERE category = ? '
+            'GROUP BY completed, priority', (category,))
+        return [(bool(completed), Priority.parse(priority), count) for completed, priority, count in rows]
+
+    def category_names(self, goals):
+        """所有分类名（包括尚未加载的）"""
+        return [row[0] for row in self.conn.execute('SELECT name FROM categories ORDER BY rowid')]
+
+    def flush(self, goals):
+        """每次变更都已提交，退出时无需再写"""
+
+    def close(self):
+        """关闭数据库连接"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _insert(self, category, goal):
+        """插入一行目标并返回行号"""
+        cursor = self.conn.execute(
+            'INSERT INTO goals (category, text, completed, priority, priority_rank) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (category, goal.text, int(goal.completed), goal.priority.label, int(goal.priority)))
+        return cursor.lastrowid
+
+class BinaryStorage(JournalStorage):
+    """二进制快照存储：goals.bin 用 mmap 打开，分类在首次被访问时才解码
+
+    文件结构（小端）：
+      文件头    魔数 b'MTGB'、版本、分类数、文本区偏移
+      分类表    每个分类：名称长度 + 名称 + (目标头偏移, 目标数, 6 个分组计数)
+      目标头    每个目标定长：(id, 文本偏移, 文本长度, 附加字段长度, 完成状态, 优先级)
+      文本区    目标文本（UTF-8），附加字段（JSON）紧跟在文本之后
+    分组计数按 (完成状态, 优先级) 统计，未解码的分类也能直接得到进度和待办数量。
+
+    变更与日志存储一样只追加到 goals.bin.journal，不需要解码其他分类；
+    加载时尚未解码的分类的日志记录在该分类解码时才回放。日志过大时由后台线程
+    生成新快照 goals.bin.compact，映射关闭后（退出时或下次加载时）再替换 goals.bin。
+    goals.json 仍是导入导出和迁移用的交换格式。
+    """
+    MAGIC = b'MTGB'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHQ')
+    NAME = struct.Struct('<H')
+    CATEGORY = struct.Struct('<QI6I')
+    GOAL = struct.Struct('<QIIIBB')
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.bin_path = os.path.splitext(path)[0] + '.bin'
+        self.journal_path = self.bin_path + '.journal'
+        self.rotated_path = self.journal_path + '.1'
+        self.compact_path = self.bin_path + '.compact'
+        self.map = None
+        self.heap_offset = 0
+        self.tables = {}  # 尚未解码的分类 -> (目标头偏移, 目标数, 分组计数)
+        self.pending = {}  # 尚未解码的分类 -> 加载时读到的日志记录
+
+    def load(self):
+        """只读取文件头、分类表和日志，目标在分类首次被访问时再解码"""
+        self._recover()
+        self._repair_journals()
+        if not os.path.exists(self.bin_path):
+            if not os.path.exists(self.path):
+                return None
+            # 首次启用时从 goals.json 迁移
+            logger.info('从 JSON 文件迁移数据到二进制快照')
+            self.save(goals_from_json(JsonStorage.load(self) or {}))
+        with open(self.bin_path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.heap_offset, tables = self._read_tables(self.map)
+        except ValueError:
+            self._close_map()
+            raise
+        categories = []
+        for category, goals_offset, goal_count, groups in tables:
+            self.tables[category] = (goals_offset, goal_count, groups)
+            categories.append(category)
+        # 日志按分类分开，分类解码时再回放
+        for path in (self.rotated_path, self.journal_path):
+            for op in self._operations(path):
+                category = op['category']
+                if op['op'] == 'remove_category':
+                    if category in categories:
+                        categories.remove(category)
+                    self.tables.pop(category, None)
+                    self.pending.pop(category, None)
+                    continue
+                if category not in categories:
+                    categories.append(category)
+                if op['op'] != 'add_category':
+                    self.pending.setdefault(category, []).append(op)
+        if not self.tables:
+            self._close_map()
+        if self.journal is None:
+            self._open_journal()
+        # 上次退出时合并未完成，继续在后台合并
+        if os.path.exists(self.rotated_path):
+            self._start_compaction()
+        return LazyGoals(self._load_category, categories)
+
+    def _load_category(self, category):
+        """解码一个分类的目标并回放它的日志记录；所有分类都解码后关闭映射"""
+        goals = []
+        if category in self.tables:
+            goals_offset, goal_count, groups = self.tables.pop(category)
+            goals = self._decode(self.map, self.heap_offset, goals_offset, goal_count)
+        ops = self.pending.pop(category, None)
+        if ops:
+            items = {category: [goal.to_dict() for goal in goals]}
+            self._apply(items, ops)
+            goals = [Goal.from_dict(item) for item in items.get(category, [])]
+        if not self.tables:
+            self._close_map()
+        return goals
+
+    def save(self, goals):
+        """整体写入快照并清空日志（批量修改时使用）"""
+        categories = self.category_names(goals)
+        # 替换文件前关闭映射，尚未解码的分类先解码
+        data = {category: goals[category] for category in categories}
+        self.tables.clear()  # 剩下的是已删除的列表
+        self.pending.clear()
+        self._close_map()
+        super().save(data)
+
+    def count_groups(self, goals, category):
+        """尚未解码、也没有日志记录的分类直接读取分类表中的分组计数"""
+        if category not in self.tables or category in self.pending:
+            return super().count_groups(goals, category)
+        groups = self.tables[category][2]
+        return [(bool(i // len(Priority)), Priority(i % len(Priority)), count)
+                for i, count in enumerate(groups) if count]
+
+    def category_names(self, goals):
+        """所有分类名（包括尚未解码的）"""
+        if isinstance(goals, LazyGoals):
+            return list(goals.categories)
+        return list(goals)
+
+    def close(self):
+        """等待后台合并结束，关闭日志和映射后替换为合并好的快照"""
+        super().close()
+        self._close_map()
+        if os.path.exists(self.compact_path):
+            self._commit_compact()
+
+    def _close_map(self):
+        """关闭映射，之后不能再解码尚未访问的分类"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def _read_tables(self, data):
+        """读取文件头和分类表，返回 (文本区偏移, [(分类, 目标头偏移, 目标数, 分组计数)])"""
+        magic, version, count, heap_offset = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f'{self.bin_path} 不是有效的目标快照文件')
+        offset = self.HEADER.size
+        tables = []
+        for _ in range(count):
+            (length,) = self.NAME.unpack_from(data, offset)
+            offset += self.NAME.size
+            category = bytes(data[offset:offset + length]).decode('utf-8')
+            offset += length
+            goals_offset, goal_count, *groups = self.CATEGORY.unpack_from(data, offset)
+            offset += self.CATEGORY.size
+            tables.append((category, goals_offset, goal_count, groups))
+        return heap_offset, tables
+
+    def _decode(self, data, heap, goals_offset, goal_count):
+        """解码一个分类的目标"""
+        goals = []
+        headers = data[goals_offset:goals_offset + goal_count * self.GOAL.size]
+        for goal_id, text_offset, text_length, extra_length, completed, priority in self.GOAL.iter_unpack(headers):
+            start = heap + text_offset
+            end = start + text_length
+            extra = json.loads(data[end:end + extra_length]) if extra_length else None
+            goals.append(Goal(data[start:end].decode('utf-8'), bool(completed), Priority(priority),
+                              goal_id, extra))
+        return goals
+
+    def _recover(self):
+        """删除写了一半的合并结果；完整的合并结果还没替换时完成替换"""
+        if os.path.exists(self.compact_path + '.tmp'):
+            os.remove(self.compact_path + '.tmp')
+        if os.path.exists(self.compact_path):
+            self._commit_compact()
+
+    def _write_compact(self, goals):
+        """把完整数据写入新快照：写完并落盘后才改名为 goals.bin.compact"""
+        categories = list(goals)
+        names = [category.encode('utf-8') for category in categories]
+        goals_offset = self.HEADER.size + sum(self.NAME.size + len(name) + self.CATEGORY.size
+                                              for name in names)
+        table, headers, heap = bytearray(), bytearray(), bytearray()
+        for name, category in zip(names, categories):
+            groups = [0] * (2 * len(Priority))
+            start = goals_offset + len(headers)
+            for goal in goals[category]:
+                text = goal.text.encode('utf-8')
+                extra = json.dumps(goal.extra, ensure_ascii=False).encode('utf-8') if goal.extra else b''
+                headers += self.GOAL.pack(goal.id, len(heap), len(text), len(extra),
+                                          goal.completed, goal.priority)
+                heap += text
+                heap += extra
+                groups[goal.completed * len(Priority) + goal.priority] += 1
+            table += self.NAME.pack(len(name)) + name
+            table += self.CATEGORY.pack(start, len(goals[category]), *groups)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, len(names), goals_offset + len(headers))
+        tmp_path = self.compact_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(table)
+            f.write(headers)
+            f.write(heap)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.compact_path)
+
+    def _commit_compact(self):
+        """删除已合并的日志（提交点），再替换快照"""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+        os.replace(self.compact_path, self.bin_path)
+
+    def _compact(self):
+        """后台线程：从磁盘读取快照并回放已轮转的日志，生成新快照
+
+        界面线程仍映射着 goals.bin（Windows 上不能替换被映射的文件），替换留到映射关闭后。
+        """
+        try:
+            with open(self.bin_path, 'rb') as f:
+                data = f.read()
+            heap_offset, tables = self._read_tables(data)
+            goals = {category: [goal.to_dict() for goal in
+                                self._decode(data, heap_offset, goals_offset, goal_count)]
+                     for category, goals_offset, goal_count, groups in tables}
+            self._replay(goals, self.rotated_path)
+            self._write_compact({category: [Goal.from_dict(item) for item in items]
+                                 for category, items in goals.items()})
+            logger.info('日志合并完成')
+        except Exception as e:
+            logger.error(f'日志合并失败: {str(e)}', exc_info=True)
+
+class PartitionedStorage(JsonStorage):
+    """分列表存储：每个列表一个文件 lists/parts/<列表名的哈希>.json，列表在首次切换到时才读取
+
+    文件名总是用列表名的哈希：任何列表名都不会与 index.json 重名，
+    只有大小写不同的列表名（如 Work 和 work）在不区分大小写的文件系统上也不会冲突。
+
+    lists/index.json 按显示顺序记录各列表的文件名，以及退出时各列表的 (完成状态, 优先级) 分组计数
+    和当时文件的 (修改时间, 大小)；文件没有变过时，未读取的列表也能直接得到进度和待办数量。
+    每次修改只重写被修改的那个列表的文件。
+    """
+    LIVE_RELOAD = False
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.directory = os.path.join(os.path.dirname(path), 'lists')
+        self.parts_directory = os.path.join(self.directory, 'parts')
+        self.index_file = GoalArchive._file(os.path.join(self.directory, 'index.json'))
+        self.entries = {}  # 列表名 -> index.json 中的记录
+
+    def load(self):
+        """只读取列表索引，列表的目标在首次被访问时再读取"""
+        if not os.path.exists(self.index_file.path):
+            if not os.path.exists(self.path):
+                return None
+            # 首次启用时从 goals.json 迁移
+            logger.info('从 JSON 文件迁移数据到分列表存储')
+            self.save(goals_from_json(JsonStorage.load(self) or {}))
+        self.entries = {entry['name']: entry for entry in self.index_file.load() or []}
+        return LazyGoals(self._load_category, self.entries)
+
+    @staticmethod
+    def file_name(category):
+        """列表的文件名（列表名 UTF-8 编码的 SHA-1，小写十六进制）"""
+        return hashlib.sha1(category.encode('utf-8')).hexdigest() + '.json'
+
+    def _partition(self, category):
+        """一个列表的文件"""
+        return GoalArchive._file(os.path.join(self.parts_directory, self.file_name(category)))
+
+    def _load_category(self, category):
+        """读取一个列表的目标"""
+        return [Goal.from_dict(item) for item in self._partition(category).load() or []]
+
+    def save(self, goals):
+        """写入所有已读取的列表和索引（未读取的列表文件没有变化，不再重写）"""
+        os.makedirs(self.parts_directory, exist_ok=True)
+        for category, category_goals in goals.items():
+            self._partition(category).save(category_goals)
+        self._write_index(goals)
+
+    def record(self, goals, op):
+        """只写入被修改的列表；增删列表时同时更新索引"""
+        category = op['category']
+        if op['op'] == 'remove_category':
+            self._write_index(goals)
+            path = self._partition(category).path
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        self._partition(category).save(goals[category])
+        if op['op'] == 'add_category':
+            self._write_index(goals)
+
+    def flush(self, goals):
+        """每次变更都已写入；退出时更新索引中的分组计数"""
+        self._write_index(goals)
+
+    def count_groups(self, goals, category):
+        """未读取的列表在文件没有变化时直接使用索引中的分组计数"""
+        entry = self.entries.get(category)
+        if category not in goals and entry and 'counts' in entry:
+            try:
+                stat = os.stat(self._partition(category).path)
+                if [stat.st_mtime_ns, stat.st_size] == entry['stat']:
+                    return [(completed, Priority.parse(priority), count)
+                            for completed, priority, count in entry['counts']]
+            except OSError:
+                pass
+        return super().count_groups(goals, category)
+
+    def category_names(self, goals):
+        """所有列表名（包括尚未读取的）"""
+        if isinstance(goals, LazyGoals):
+            return list(goals.categories)
+        return list(goals)
+
+    def _write_index(self, goals):
+        """按显示顺序写入列表索引，已读取的列表同时记下分组计数"""
+        entries = []
+        for category in self.category_names(goals):
+            entry = {'name': category}
+            if category in goals:
+                path = self._partition(category).path
+                if os.path.exists(path):
+                    stat = os.stat(path)
+                    entry['counts'] = [[completed, priority.label, count] for completed, priority, count
+                                       in JsonStorage.count_groups(self, goals, category)]
+                    entry['stat'] = [stat.st_mtime_ns, stat.st_size]
+            elif category in self.entries:
+                entry = self.entries[category]
+            entries.append(entry)
+        self.index_file.save(entries)
+        self.entries = {entry['name']: entry for entry in entries}
+
+class WriteBehindStorage(JsonStorage):
+    """后台写入：变更只标记为脏，由后台线程合并一小段时间内的变更后整体写一次快照"""
+    COALESCE_DELAY = 0.5  # 标记为脏后等待合并的秒数
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.goals = None
+        self.pending = False
+        # 取快照和写文件的整个过程持有，后台写入和同步写入不会交错，旧快照也不会覆盖新快照
+        self.write_lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopped = threading.Event()
+        self.worker = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self.worker.start()
+
+    def save(self, goals):
+        """标记为脏，由后台线程写入"""
+        self.mark_dirty(goals)
+
+    def record(self, goals, op):
+        """标记为脏，由后台线程写入"""
+        self.mark_dirty(goals)
+
+    def mark_dirty(self, goals):
+        """标记数据需要写入（界面线程调用，不访问磁盘）"""
+        self.goals = goals
+        self.pending = True
+        self.dirty.set()
+
+    def flush(self, goals):
+        """同步写入尚未落盘的变更（后台线程继续运行）"""
+        self.goals = goals
+        self._write()
+
+    def close(self):
+        """停止后台线程，并写入剩余的变更"""
+        self._stop()
+        self._write()
+
+    def _stop(self):
+        """通知后台线程退出并等待它结束"""
+        self.stopped.set()
+        self.dirty.set()
+        if self.worker.is_alive():
+            self.worker.join()
+
+    def _run(self):
+        """后台线程：等待脏标记，合并一段时间内的变更后写一次快照"""
+        while not self.stopped.is_set():
+            self.dirty.wait()
+            if self.stopped.wait(self.COALESCE_DELAY):
+                break
+            self.dirty.clear()
+            try:
+                self._write()
+            except WriteConflictError as e:
+                # 等界面线程合并外部修改后再次标记为脏
+                logger.warning(str(e))
+            except Exception as e:
+                logger.error(f'后台保存数据失败: {str(e)}', exc_info=True)
+
+    def _write(self):
+        """有尚未写入的变更时取一份快照写入；失败时保留脏标记并抛出异常"""
+        with self.write_lock:
+            # 持锁只做一次浅拷贝，序列化和写文件都在锁外进行
+            with self.lock:
+                if not self.pending:
+                    return
+                self.pending = False
+                snapshot = {category: [goal.copy() for goal in goals]
+                            for category, goals in self.goals.items()}
+            try:
+                JsonStorage.save(self, snapshot)
+            except Exception:
+                self.pending = True
+                raise
+
+STORAGE_BACKENDS = {
+    'json': JsonStorage,
+    'journal': JournalStorage,
+    'sqlite': SqliteStorage,
+    'binary': BinaryStorage,
+    'lists': PartitionedStorage,
+}
+
+# 按周期结转的内置列表，其余列表由用户新建
+PERIOD_CATEGORIES = ('weekly', 'monthly', 'yearly')
+
+def period_of(category, day):
+    """日期所在的周期名（本周 2024-W05、本月 2024-01、本年 2024），其他分类没有周期"""
+    if category == 'weekly':
+        year, week, _ = day.isocalendar()
+        return f'{year}-W{week:02d}'
+    if category == 'monthly':
+        return day.strftime('%Y-%m')
+    if category == 'yearly':
+        return str(day.year)
+    return None
+
+class GoalArchive:
+    """按周期归档的目标：archives/<分类>/<周期>.json，只在浏览历史时读取
+
+    archives/periods.json 记录各分类当前数据所属的周期，用于判断是否需要结转。
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.periods_storage = self._file(os.path.join(directory, 'periods.json'))
+        try:
+            self.periods = self.periods_storage.load() or {}
+        except Exception as e:
+            logger.error(f'读取周期记录失败: {str(e)}')
+            self.periods = {}
+
+    @staticmethod
+    def _file(path):
+        """归档目录中的一个 JSON 文件（只由本程序写入，不监视外部修改）"""
+        storage = JsonStorage(path)
+        storage.LIVE_RELOAD = False
+        return storage
+
+    def storage(self, category, period):
+        """某个周期的归档文件"""
+        return self._file(os.path.join(self.directory, category, f'{period}.json'))
+
+    def list_periods(self, category):
+        """分类已归档的周期，最近的在前（只列出文件名，不读取内容）"""
+        directory = os.path.join(self.directory, category)
+        if not os.path.isdir(directory):
+            return []
+        return sorted((os.path.splitext(name)[0] for name in os.listdir(directory)
+                       if name.endswith('.json')), reverse=True)
+
+    def load(self, category, period):
+        """读取一个周期的归档目标"""
+        return self.storage(category, period).load() or []
+
+    def append(self, category, period, goals):
+        """把目标追加到周期的归档文件"""
+        os.makedirs(os.path.join(self.directory, category), exist_ok=True)
+        storage = self.storage(category, period)
+        storage.save((storage.load() or []) + [goal.to_dict() for goal in goals])
+
+    def save_periods(self, periods):
+        """记录各分类当前数据所属的周期"""
+        os.makedirs(self.directory, exist_ok=True)
+        self.periods.update(periods)
+        self.periods_storage.save(self.periods)
+
+QUOTE_PAGE_SIZE = 100  # 语录编辑器每页的条数
+
+class QuoteStore:
+    """按行存储的励志语录：quotes.txt 每行一条，quotes.idx 是各行起始位置的偏移索引
+
+    只把偏移索引（每条 8 字节）读入内存，语录按下标定位后读取一行；添加语录只追加一行和一个偏移。
+    索引文件头记录它对应的语录文件大小，语录文件被其他程序修改后会逐行扫描重建索引。
+    """
+    HEADER = struct.Struct('<Q')
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + '.idx'
+        self.offsets = array.array('Q')
+        self.size = 0  # 索引覆盖到的语录文件大小
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def open(self, legacy_path=None):
+        """读取偏移索引；语录文件不存在时从旧的 quotes.json 迁移"""
+        if not os.path.exists(self.path):
+            quotes = []
+            if legacy_path and os.path.exists(legacy_path):
+                logger.info(f'从 {legacy_path} 迁移励志语录')
+                with open(legacy_path, 'r', encoding='utf-8') as f:
+                    quotes = json.load(f).get('quotes', [])
+            self.rewrite(quotes)
+            return self
+        if not self._load_index():
+            self.rebuild_index()
+        return self
+
+    def _load_index(self):
+        """读取索引文件，与语录文件不一致（或索引文件被截断、长度不对齐）时返回 False"""
+        if not os.path.exists(self.index_path):
+            return False
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        if len(data) < self.HEADER.size or (len(data) - self.HEADER.size) % 8:
+            return False
+        (size,) = self.HEADER.unpack_from(data)
+        if size != os.path.getsize(self.path):
+            return False
+        offsets = array.array('Q')
+        offsets.frombytes(data[self.HEADER.size:])
+        if offsets and offsets[-1] >= size:
+            return False
+        self.offsets, self.size = offsets, size
+        return True
+
+    def rebuild_index(self):
+        """逐行扫描语录文件重建索引（不把整个文件读入内存）"""
+        offsets = array.array('Q')
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    offsets.append(offset)
+                offset += len(line)
+        self.offsets, self.size = offsets, offset
+        self._write_index()
+        logger.info(f'重建励志语录索引: {len(offsets)} 条')
+
+    def _write_index(self):
+        """整体写入索引文件：先写临时文件再原子替换"""
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.size))
+            f.write(self.offsets.tobytes())
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, index):
+        """读取第 index 条语录"""
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[index])
+            return f.readline().decode('utf-8').strip()
+
+    def page(self, start, count):
+        """读取从 start 开始的 count 条语录"""
+        quotes = []
+        if start >= len(self.offsets):
+            return quotes
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[start])
+            for line in f:
+                if line.strip():
+                    quotes.append(line.decode('utf-8').strip())
+                    if len(quotes) == count:
+                        break
+        return quotes
+
+    def append(self, quote):
+        """追加一条语录：语录文件追加一行，索引追加一个偏移后再更新文件头
+
+        先写偏移再写文件头：中途崩溃时文件头仍是旧的大小，与语录文件对不上，下次打开会重建索引。
+        """
+        line = (' '.join(quote.split()) + '\n').encode('utf-8')
+        with open(self.path, 'a+b') as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset:
+                # 其他程序写入的文件最后一行可能没有换行符
+                f.seek(offset - 1)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+                    offset += 1
+            f.write(line)
+        self.offsets.append(offset)
+        self.size = offset + len(line)
+        with open(self.index_path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            f.write(array.array('Q', [offset]).tobytes())
+            f.flush()
+            f.seek(0)
+            f.write(self.HEADER.pack(self.size))
+
+    def replace_page(self, start, count, quotes):
+        """把从 start 开始的 count 条语录替换为 quotes：前面的内容原样复制，之后逐行重建索引"""
+        head = self.offsets[start] if start < len(self.offsets) else self.size
+        tail = self.offsets[start + count] if start + count < len(self.offsets) else self.size
+        tmp_path = self.path + '.tmp'
+        with open(self.path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            self._copy(src, dst, head)
+            for quote in quotes:
+                dst.write((' '.join(quote.split()) + '\n').encode('utf-8'))
+            src.seek(tail)
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, self.path)
+        self.rebuild_index()
+
+    def rewrite(self, quotes):
+        """整体写入语录（迁移时使用）"""
+        with open(self.path, 'w', encoding='utf-8', newline='\n') as f:
+            for quote in quotes:
+                quote = ' '.join(str(quote).split())
+                if quote:
+                    f.write(quote + '\n')
+        self.rebuild_index()
+
+    @staticmethod
+    def _copy(src, dst, length):
+        """从 src 复制 length 字节到 dst"""
+        while length > 0:
+            chunk = src.read(min(length, 1024 * 1024))
+            if not chunk:
+                break
+            dst.write(chunk)
+            length -= len(chunk)
+
+# 导入导出的列：CSV 的表头，JSONL 每行一个对象
+GOAL_FIELDS = ['category', 'text', 'completed', 'priority']
+TRUE_VALUES = {'true', '1', 'yes', 'y', '是', '已完成'}
+FALSE_VALUES = {'false', '0', 'no', 'n', '否', '未完成', ''}
+
+def read_goal_rows(path):
+    """逐行读取 CSV（按表头）或 JSONL 文件，产生 (行号, 原始行)，不整体读入内存"""
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    else:
+        # JSONL 的每一行在 parse_goal_row 中解析，某一行格式错误只跳过该行
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, line
+
+def parse_goal_row(row, default_category):
+    """校验一行导入数据（CSV 的字典或 JSONL 的一行文本），返回 (分类, 目标)；不合法时抛出 ValueError"""
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise ValueError('不是对象')
+    text = str(row.get('text') or '').strip()
+    if not text:
+        raise ValueError('目标内容为空')
+    priority = Priority.parse(row.get('priority') or 'low')
+    completed = row.get('completed', False)
+    if not isinstance(completed, bool):
+        value = str(completed or '').strip().lower()
+        if value not in TRUE_VALUES | FALSE_VALUES:
+            raise ValueError(f'无法识别的完成状态: {completed}')
+        completed = value in TRUE_VALUES
+    category = str(row.get('category') or default_category).strip()
+    return category, Goal(text, completed, priority)
+
+def write_goal_rows(path, rows):
+    """把 (分类, 目标) 逐行写入 CSV 或 JSONL 文件，不在内存中拼接整个文件"""
+    count = 0
+    if path.lower().endswith('.csv'):
+        # 带 BOM，Excel 打开中文不乱码
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(GOAL_FIELDS)
+            for category, goal in rows:
+                writer.writerow([category, goal.text, goal.completed, goal.priority.label])
+                count += 1
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            for category, goal in rows:
+                f.write(json.dumps({'category': category, 'text': goal.text,
+                                    'completed': goal.completed, 'priority': goal.priority.label},
+                                   ensure_ascii=False))
+                f.write('\n')
+                count += 1
+    return count
+
+def goal_content(goal):
+    """目标的内容（用于比较两份数据中的目标是否相同）"""
+    return (goal.text, goal.completed, goal.priority)
+
+def diff_goals(old_goals, new_goals):
+    """比较同一分类的两份目标列表，返回 (新增, 删除, [(旧目标, 变化的字段)])
+
+    按 id 配对，同一 id 的目标比较各字段（包括文本）。两边 id 对不上的目标（文件中缺少 id 时
+    每次读取都会重新分配）再按内容配对：内容完全相同的视为未变，其余按文本配对，
+    只有完成状态或优先级不同时算作修改，文本被改动的表现为一删一增。
+    """
+    new_by_id = {goal.id: goal for goal in new_goals}
+    remaining = collections.defaultdict(list)  # 内容 -> 尚未配对的旧目标
+    updated = []
+    for old in old_goals:
+        goal = new_by_id.pop(old.id, None)
+        if goal is None:
+            remaining[goal_content(old)].append(old)
+            continue
+        fields = {field: getattr(goal, field) for field in Goal.FIELDS
+                  if getattr(goal, field) != getattr(old, field)}
+        if fields:
+            updated.append((old, fields))
+    rest = []
+    for goal in new_goals:
+        if goal.id not in new_by_id:
+            continue
+        if remaining[goal_content(goal)]:
+            remaining[goal_content(goal)].pop()
+        else:
+            rest.append(goal)
+
+    by_text = collections.defaultdict(list)
+    for goals in remaining.values():
+        for goal in goals:
+            by_text[goal.text].append(goal)
+    added = []
+    for goal in rest:
+        if by_text[goal.text]:
+            old = by_text[goal.text].pop()
+            updated.append((old, {field: getattr(goal, field) for field in ('completed', 'priority')
+                                  if getattr(goal, field) != getattr(old, field)}))
+        else:
+            added.append(goal)
+    removed = [goal for goals in by_text.values() for goal in goals]
+    return added, removed, updated
+
+def goal_key(goal):
+    """目标的稳定标识"""
+    return goal.id
+
+def goal_sort_key(goal):
+    """目标排序键"""
+    return (
+        goal.completed,  # 首先按完成状态排序（False在前）
+        goal.priority,  # 然后按优先级排序（高>中>低）
+        goal.text  # 最后按文本内容排序
+    )
+
+class GoalCounters:
+    """一个分类的目标计数：总数、已完成数和各优先级数量，随增删改增量更新"""
+    def __init__(self, groups=()):
+        self.total = 0
+        self.completed = 0
+        self.by_priority = {priority: 0 for priority in Priority}
+        for completed, priority, count in groups:
+            self.add(completed, priority, count)
+
+    def add(self, completed, priority, count=1):
+        """计入 count 个目标（count 为负数时表示移除）"""
+        self.total += count
+        if completed:
+            self.completed += count
+        self.by_priority[priority] += count
+
+    def add_key(self, key, count=1):
+        """按排序键计入目标"""
+        self.add(key[0], key[1], count)
+
+class SortedGoalIndex:
+    """一个分类按排序键维护的有序目标列表，增删改只做二分查找和插入/删除"""
+    def __init__(self, goals):
+        self.goals = sorted(goals, key=goal_sort_key)
+        self.keys = [goal_sort_key(goal) for goal in self.goals]
+
+    def find(self, goal, key):
+        """按排序键二分查找目标的位置（排序键相同时再按对象身份确认）"""
+        index = bisect.bisect_left(self.keys, key)
+        while self.goals[index] is not goal:
+            index += 1
+        return index
+
+    def insert(self, goal):
+        """插入一个目标，返回它的位置"""
+        key = goal_sort_key(goal)
+        index = bisect.bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.goals.insert(index, goal)
+        return index
+
+    def remove(self, goal, key):
+        """删除一个目标（key 为它的排序键），返回它原来的位置"""
+        index = self.find(goal, key)
+        del self.keys[index]
+        del self.goals[index]
+        return index
+
+    def move(self, goal, old_key):
+        """目标的排序键从 old_key 变化后把它移动到新位置"""
+        self.remove(goal, old_key)
+        return self.insert(goal)
+
+class GoalSearchIndex:
+    """目标文本的倒排索引：按单字和相邻两字（bigram）建立，中文无需分词
+
+    查询时取查询串的各个双字，从最短的倒排列表开始求交集，
+    只对候选目标做一次子串确认，不需要遍历全部目标。
+    """
+    def __init__(self, goals=()):
+        self.postings = collections.defaultdict(set)  # 单字或双字 -> 目标标识集合
+        self.entries = {}  # 目标标识 -> (分类, 目标, 规范化后的文本)
+        for category, goal in goals:
+            self.add(category, goal)
+
+    @staticmethod
+    def normalize(text):
+        """忽略大小写和空白"""
+        return ''.join(text.lower().split())
+
+    @staticmethod
+    def grams(text):
+        """规范化文本的单字和双字集合"""
+        return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def add(self, category, goal):
+        """索引一个目标"""
+        key = goal_key(goal)
+        text = self.normalize(goal.text)
+        self.entries[key] = (category, goal, text)
+        for gram in self.grams(text):
+            self.postings[gram].add(key)
+
+    def remove(self, goal):
+        """移除一个目标的索引"""
+        key = goal_key(goal)
+        category, goal, text = self.entries.pop(key)
+        for gram in self.grams(text):
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+        return category
+
+    def update(self, goal):
+        """目标文本变化后重新索引"""
+        self.add(self.remove(goal), goal)
+
+    def category_of(self, goal):
+        """目标所在的分类"""
+        return self.entries[goal_key(goal)][0]
+
+    def search(self, query):
+        """返回包含查询串的所有目标 [(分类, 目标)]，顺序不定"""
+        query = self.normalize(query)
+        if not query:
+            return []
+        grams = {query[i:i + 2] for i in range(len(query) - 1)} or {query}
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        results = []
+        for key in candidates:
+            category, goal, text = self.entries[key]
+            if query in text:
+                results.append((category, goal))
+        return results
+
+class UndoHistory:
+    """撤销/重做记录：有界环形缓冲区中只保存操作本身，每步占用固定内存
+
+    记录为 ('add', 分类, 目标, 位置)、('remove', 分类, 目标, 位置)
+    或 ('update', 分类, 目标, 旧字段值, 新字段值)，撤销时执行它的逆操作。
+    """
+    def __init__(self, limit=200):
+        self.undo_stack = collections.deque(maxlen=limit)
+        self.redo_stack = collections.deque(maxlen=limit)
+        self.replay_depth = 0
+
+    def record(self, entry):
+        """记录一次新的修改（撤销/重做过程中的修改不记录），并清空重做记录"""
+        if self.replay_depth:
+            return
+        self.undo_stack.append(entry)
+        self.redo_stack.clear()
+
+    @contextlib.contextmanager
+    def replaying(self):
+        """撤销或重做期间暂停记录"""
+        self.replay_depth += 1
+        try:
+            yield
+        finally:
+            self.replay_depth -= 1
+
+    def pop_undo(self):
+        """取出最近一条撤销记录，没有时返回 None"""
+        return self.undo_stack.pop() if self.undo_stack else None
+
+    def pop_redo(self):
+        """取出最近一条重做记录，没有时返回 None"""
+        return self.redo_stack.pop() if self.redo_stack else None
+
+    def push_undo(self, entry):
+        """重做完成后放回撤销记录"""
+        self.undo_stack.append(entry)
+
+    def push_redo(self, entry):
+        """撤销完成后放入重做记录"""
+        self.redo_stack.append(entry)
+
+    def clear(self):
+        """清空记录（批量修改或重新加载之后）"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+class GoalModel:
+    """与界面无关的目标数据模型：目标数据、有序索引、计数器和持久化
+
+    所有增删改都通过这里进行，完成后通知监听者（界面据此只修补受影响的行）。
+    """
+    def __init__(self, storage, persist=None):
+        self.storage = storage
+        # 保存回调，参数为变更记录（None 表示整体保存）；默认直接写入存储
+        self.persist = persist or self.write
+        self.goals = {}
+        self.sorted_indexes = {}  # 分类 -> SortedGoalIndex
+        self.counters = {}  # 分类 -> GoalCounters
+        self.search = None  # GoalSearchIndex，首次搜索时建立
+        self.history = UndoHistory()
+        self.listeners = []  # 回调参数: (变更类型, 分类, 目标, 变更前的排序键)
+
+    def load(self):
+        """从存储加载数据，没有数据时创建默认数据"""
+        return self.set_goals(self.read())
+
+    def read(self):
+        """从存储读取数据（不修改模型，可在后台线程中执行），没有数据时创建默认数据
+
+        数据文件存在但读取失败时抛出异常：默认数据会覆盖无法读取的文件，因此不创建。
+        """
+        try:
+            data = self.storage.load()
+            if data and not isinstance(data, LazyGoals):
+                data = goals_from_json(data)
+        except Exception as e:
+            logger.error(f'数据加载失败: {str(e)}', exc_info=True)
+            raise
+        if data:
+            logger.info('成功加载数据')
+        else:
+            if data is not None:
+                logger.warning('数据文件为空，创建新的数据结构')
+            data = self.create_default_data()
+        return data
+
+    def set_goals(self, data):
+        """替换目标数据，有序索引和计数器在下次访问时重建"""
+        self.goals = data
+        self.sorted_indexes.clear()
+        self.counters.clear()
+        self.search = None
+        self.history.clear()
+        return data
+
+    def create_default_data(self):
+        """创建默认的数据结构"""
+        default_data = {
+            'weekly': [
+                Goal('1.完成myshell商品上架', False, Priority.LOW),
+                Goal('3.完成透明数据库系统', False, Priority.LOW),
+                Goal('4.ai宣传视频模块制作', False, Priority.LOW),
+                Goal('2.明年计划', False, Priority.MEDIUM)
+            ],
+            'monthly': [],
+            'yearly': []
+        }
+        try:
+            self.storage.save(default_data)
+            logger.info('创建新的数据文件')
+        except Exception as e:
+            logger.error(f'创建数据文件失败: {str(e)}')
+        return default_data
+
+    def write(self, op=None):
+        """写入存储；传入变更记录时由存储后端决定是否只追加这一条"""
+        if op is None:
+            self.storage.save(self.goals)
+        else:
+            self.storage.record(self.goals, op)
+
+    def flush(self):
+        """写入尚未落盘的数据"""
+        self.storage.flush(self.goals)
+
+    def close(self):
+        """关闭存储"""
+        self.storage.close()
+
+    def sorted_index(self, category):
+        """获取分类的有序索引，不存在时建立"""
+        if category not in self.sorted_indexes:
+            self.sorted_indexes[category] = SortedGoalIndex(self.goals[category])
+        return self.sorted_indexes[category]
+
+    def goal_counters(self, category):
+        """获取分类的计数器，首次使用时统计一次，之后由增删改增量维护"""
+        if category not in self.counters:
+            self.counters[category] = GoalCounters(self.storage.count_groups(self.goals, category))
+        return self.counters[category]
+
+    def search_index(self):
+        """获取所有分类的全文索引，不存在时建立（尚未加载的分类会被加载）"""
+        if self.search is None:
+            self.search = GoalSearchIndex(
+                (category, goal)
+                for category in self.storage.category_names(self.goals)
+                for goal in self.goals[category])
+        return self.search
+
+    def search_goals(self, query):
+        """搜索所有分类中文本包含 query 的目标，按排序键返回 [(分类, 目标)]"""
+        results = self.search_index().search(query)
+        results.sort(key=lambda item: goal_sort_key(item[1]))
+        return results
+
+    def todo_count(self):
+        """所有分类中未完成目标的数量"""
+        todo = 0
+        for category in self.storage.category_names(self.goals):
+            counters = self.goal_counters(category)
+            todo += counters.total - counters.completed
+        return todo
+
+    def progress(self, category):
+        """分类的 (已完成数, 完成百分比)"""
+        counters = self.goal_counters(category)
+        if counters.total == 0:
+            return 0, 0
+        return counters.completed, counters.completed / counters.total * 100
+
+    def add_goal(self, category, goal, index=None):
+        """添加一个目标（默认在分类末尾，撤销删除时插回原来的位置）"""
+        op = {'op': 'add', 'category': category, 'goal': goal}
+        with self.storage.lock:
+            if index is None:
+                index = len(self.goals[category])
+                self.goals[category].append(goal)
+            else:
+                self.goals[category].insert(index, goal)
+                op['index'] = index
+        self.persist(op)
+        self.history.record(('add', category, goal, index))
+        if category in self.sorted_indexes:
+            self.sorted_indexes[category].insert(goal)
+        if category in self.counters:
+            self.counters[category].add(goal.completed, goal.priority)
+        if self.search is not None:
+            self.search.add(category, goal)
+        self._notify('add', category, goal, None)
+
+    def update_goal(self, category, goal, **fields):
+        """修改目标的字段"""
+        old_key = goal_sort_key(goal)
+        old_fields = {field: getattr(goal, field) for field in fields}
+        with self.storage.lock:
+            for field, value in fields.items():
+                setattr(goal, field, value)
+            if 'priority' in fields and goal.extra and 'priority' in goal.extra:
+                # 无法识别的原优先级（见 Goal.from_dict）已被用户选择的优先级取代
+                goal.extra = {key: value for key, value in goal.extra.items() if key != 'priority'} or None
+        self.persist({'op': 'update', 'category': category, 'id': goal.id,
+                      'fields': encode_fields(fields)})
+        self.history.record(('update', category, goal, old_fields, dict(fields)))
+        if category in self.sorted_indexes:
+            self.sorted_indexes[category].move(goal, old_key)
+        if category in self.counters:
+            self.counters[category].add_key(old_key, -1)
+            self.counters[category].add(goal.completed, goal.priority)
+        if self.search is not None and 'text' in fields:
+            self.search.update(goal)
+        self._notify('update', category, goal, old_key)
+
+    def remove_goal(self, category, goal):
+        """删除目标（按对象身份删除，避免误删内容相同的另一个目标）"""
+        old_key = goal_sort_key(goal)
+        # 位置只用于撤销时插回原处；Goal 没有定义 __eq__，list.index 在 C 层按对象身份比较
+        index = self.goals[category].index(goal)
+        with self.storage.lock:
+            del self.goals[category][index]
+        self.persist({'op': 'remove', 'category': category, 'id': goal.id})
+        self.history.record(('remove', category, goal, index))
+        if category in self.sorted_indexes:
+            self.sorted_indexes[category].remove(goal, old_key)
+        if category in self.counters:
+            self.counters[category].add_key(old_key, -1)
+        if self.search is not None:
+            self.search.remove(goal)
+        self._notify('remove', category, goal, old_key)
+
+    def merge(self, base, theirs):
+        """把其他程序对数据文件的修改合并进当前数据，返回冲突数量
+
+        比较 base（上次读写时的文件内容）和 theirs（现在的文件内容）得到外部做了哪些增删改，
+        再按目标逐个应用到当前数据上：只有受影响的目标会通知监听者，界面只修补对应的行。
+        当前数据中同一个目标也已被修改或删除时算作冲突，保留本程序的版本。
+        这些变化来自文件本身，不再写回存储。
+        """
+        persist, self.persist = self.persist, lambda op=None: None
+        conflicts = 0
+        ids = {goal_key(goal) for goals in self.goals.values() for goal in goals}
+        try:
+            for category in list(theirs) + [c for c in base if c not in theirs]:
+                if category not in self.goals:
+                    with self.storage.lock:
+                        self.goals[category] = []
+                base_goals = base.get(category, [])
+                added, removed, updated = diff_goals(base_goals, theirs.get(category, []))
+                # 当前数据中的对应目标按 id 查找，基准中没有的 id 再按内容查找
+                base_ids = {goal.id for goal in base_goals}
+                ours_by_id, ours = {}, collections.defaultdict(list)
+                for goal in self.goals[category]:
+                    if goal.id in base_ids:
+                        ours_by_id[goal.id] = goal
+                    else:
+                        ours[goal_content(goal)].append(goal)
+
+                def unchanged(old):
+                    """当前数据中与基准相同（本程序没有修改或删除）的对应目标，没有时返回 None"""
+                    goal = ours_by_id.pop(old.id, None)
+                    if goal is None and ours[goal_content(old)]:
+                        goal = ours[goal_content(old)].pop()
+                    if goal is not None and goal_content(goal) == goal_content(old):
+                        return goal
+                    return None
+
+                for old, fields in updated:
+                    goal = unchanged(old)
+                    if goal is not None:
+                        self.update_goal(category, goal, **fields)
+                    else:
+                        conflicts += 1
+                for old in removed:
+                    goal = unchanged(old)
+                    if goal is not None:
+                        self.remove_goal(category, goal)
+                    else:
+                        conflicts += 1
+                for goal in added:
+                    goal = goal.copy()
+                    if goal.id in ids:
+                        # 其他程序新增的目标与本程序的目标 id 相同时重新分配
+                        goal.id = Goal.next_id()
+                    ids.add(goal.id)
+                    self.add_goal(category, goal)
+        finally:
+            self.persist = persist
+            # 合并后目标的位置和内容都可能变化，之前的撤销记录不再可靠
+            self.history.clear()
+        return conflicts
+
+    def add_goals(self, items):
+        """批量添加 (分类, 目标)：边读边加入数据，最后只整体保存一次、通知一次，返回添加的数量"""
+        added = []
+        try:
+            for category, goal in items:
+                with self.storage.lock:
+                    self.goals[category].append(goal)
+                added.append((category, goal))
+        finally:
+            # 读取中途出错时，已经加入的目标同样要保存并显示
+            if added:
+                self.persist(None)
+                for category in {category for category, goal in added}:
+                    self.sorted_indexes.pop(category, None)
+                    self.counters.pop(category, None)
+                if self.search is not None:
+                    for category, goal in added:
+                        self.search.add(category, goal)
+                self.history.clear()
+                self._notify('reset', None, None, None)
+        return len(added)
+
+    def remove_goals(self, category, goals):
+        """批量删除目标：只整体保存一次，分类的有序索引和计数器在下次访问时重建"""
+        keys = {goal_key(goal) for goal in goals}
+        with self.storage.lock:
+            self.goals[category][:] = [g for g in self.goals[category] if goal_key(g) not in keys]
+        self.persist(None)
+        self.sorted_indexes.pop(category, None)
+        self.counters.pop(category, None)
+        if self.search is not None:
+            for goal in goals:
+                self.search.remove(goal)
+        self.history.clear()
+        self._notify('reset', category, None, None)
+
+    def add_category(self, category):
+        """新建一个空列表（排在最后）"""
+        with self.storage.lock:
+            self.goals[category] = []
+            if isinstance(self.goals, LazyGoals):
+                self.goals.categories.append(category)
+        self.persist({'op': 'add_category', 'category': category})
+        self._notify('categories', category, None, None)
+
+    def remove_category(self, category):
+        """删除一个列表及其中的目标"""
+        with self.storage.lock:
+            goals = self.goals.pop(category, [])
+            if isinstance(self.goals, LazyGoals):
+                self.goals.categories.remove(category)
+        self.persist({'op': 'remove_category', 'category': category})
+        self.sorted_indexes.pop(category, None)
+        self.counters.pop(category, None)
+        if self.search is not None:
+            for goal in goals:
+                self.search.remove(goal)
+        # 撤销记录可能指向被删除的列表
+        self.history.clear()
+        self._notify('categories', category, None, None)
+
+    def archive_period(self, category, archive, period, carry_forward=True):
+        """把分类中属于已结束周期的目标移入归档：已完成的都归档，未完成的按 carry_forward 决定是否留下"""
+        goals = [goal for goal in self.goals[category] if goal.completed or not carry_forward]
+        if goals:
+            # 先写归档再从当前数据中删除，中途崩溃最多重复归档，不会丢失目标
+            archive.append(category, period, goals)
+            self.remove_goals(category, goals)
+            self.flush()
+        return len(goals)
+
+    def undo(self):
+        """撤销最近一次修改，返回是否有可撤销的修改"""
+        entry = self.history.pop_undo()
+        if entry is None:
+            return False
+        with self.history.replaying():
+            kind, category, goal = entry[:3]
+            if kind == 'add':
+                self.remove_goal(category, goal)
+            elif kind == 'remove':
+                self.add_goal(category, goal, entry[3])
+            else:
+                self.update_goal(category, goal, **entry[3])
+        self.history.push_redo(entry)
+        return True
+
+    def redo(self):
+        """重做最近一次撤销的修改，返回是否有可重做的修改"""
+        entry = self.history.pop_redo()
+        if entry is None:
+            return False
+        with self.history.replaying():
+            kind, category, goal = entry[:3]
+            if kind == 'add':
+                self.add_goal(category, goal, entry[3])
+            elif kind == 'remove':
+                self.remove_goal(category, goal)
+            else:
+                self.update_goal(category, goal, **entry[4])
+        self.history.push_undo(entry)
+        return True
+
+    def _notify(self, action, category, goal, old_key):
+        """通知监听者数据发生了变化"""
+        for listener in self.listeners:
+            listener(action, category, goal, old_key)
+
+class GoalRow:
+    """虚拟列表中可复用的一行目标控件"""
+    def __init__(self, goal_list):
+        themes = goal_list.app.themes
+        self.app = goal_list.app
+        self.goal = None
+        self.index = -1
+        self.frame = themes.register(tk.Frame(goal_list.canvas), bg='bg')
+        self.var = tk.BooleanVar(value=False)
+        self.check = tk.Checkbutton(self.frame,
+                                    variable=self.var,
+                                    command=lambda: goal_list.app.toggle_goal(self.goal, self.var))
+        themes.register(self.check, bg='bg', activebackground='bg')
+        self.check.pack(side='left', padx=(5, 0))
+        self.priority_label = themes.register(tk.Label(self.frame), bg='bg')
+        self.priority_label.pack(side='left', padx=5)
+        self.text_label = tk.Label(self.frame,
+                                   font=('微软雅黑', 10),
+                                   anchor='w',
+                                   justify='left')
+        themes.register(self.text_label, bg='bg')
+        self.text_label.pack(side='left', fill='x', expand=True, padx=5)
+
+        # 事件只在创建时绑定一次，回调通过 self.goal 找到当前显示的目标
+        # 悬停变色按帧合并：快速划过多行时每帧每行最多重新着色一次
+        self.frame.bind('<Enter>', lambda e: goal_list.app.motion.submit(self, self.set_hover, True))
+        self.frame.bind('<Leave>', lambda e: goal_list.app.motion.submit(self, self.set_hover, False))
+        for widget in [self.frame, self.text_label]:
+            widget.bind('<Button-3>', lambda e: goal_list.app.show_goal_menu(e, self.goal))
+
+        self.window = goal_list.canvas.create_window(0, 0, window=self.frame, anchor='nw',
+                                                     state='hidden')
+
+    def set_hover(self, hovered):
+        """设置悬停背景色"""
+        if not self.frame.winfo_exists():
+            return  # 界面重建后行已被销毁
+        theme = self.app.current_theme
+        self.frame.configure(bg=theme['hover'] if hovered else theme['bg'])
+
+    def bind_goal(self, goal, theme):
+        """把目标数据填充到这一行（背景色由主题注册表负责）"""
+        self.goal = goal
+        self.var.set(goal.completed)
+        self.priority_label.configure(text=PRIORITY_ICONS[goal.priority])
+        self.text_label.configure(text=goal.text)
+        self.apply_colors(theme)
+
+    def apply_colors(self, theme):
+        """按目标状态设置文字颜色（优先级和完成状态决定，不在注册表中）"""
+        text_color = theme['completed_fg'] if self.goal.completed else theme['fg']
+        self.priority_label.configure(fg=theme[f'{self.goal.priority.label}_priority'])
+        self.text_label.configure(fg=text_color)
+
+class VirtualGoalList:
+    """虚拟化目标列表：只为可见区域（加少量预留行）创建控件，滚动时循环复用"""
+    ROW_HEIGHT = 30  # 固定行高，用于把滚动位置换算为行号
+    OVERSCAN = 3     # 可见区域上下各多渲染的行数
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.items = []
+        self.rows = []
+        self.rows_by_goal = {}  # goal_key -> 正在显示该目标的行
+        self.width = 1
+
+        self.canvas = tk.Canvas(parent,
+                                highlightthickness=0,
+                                yscrollincrement=self.ROW_HEIGHT)
+        app.themes.register(self.canvas, bg='bg')
+        self.scrollbar = ttk.Scrollbar(parent, orient='vertical',
+                                       command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.bind('<Configure>', self._on_configure)
+
+    def set_items(self, items):
+        """替换列表数据并重绘可见行"""
+        self.items = items
+        self._update_scrollregion()
+        self.refresh()
+
+    def refresh(self):
+        """强制重新填充所有可见行（整体重建时使用）"""
+        for row in self.rows:
+            row.goal = None
+        self.rows_by_goal.clear()
+        self._layout()
+
+    def apply_theme(self, theme):
+        """主题切换后只重设可见行的文字颜色，背景色已由主题注册表统一更新"""
+        for row in self.rows:
+            if row.goal is not None:
+                row.apply_colors(theme)
+
+    def items_changed(self, goal=None):
+        """列表数据被增删或移动后调用：只重新填充受影响的可见行
+
+        items 与有序索引共用同一个列表，这里不修改列表本身；
+        goal 为内容发生变化（或被删除）的目标，其所在行会被强制重新填充。
+        """
+        if goal is not None:
+            self._invalidate(goal)
+        self._update_scrollregion()
+        self._layout()
+
+    def _invalidate(self, goal):
+        """让显示该目标的行在下次布局时重新填充"""
+        row = self.rows_by_goal.pop(goal_key(goal), None)
+        if row is not None:
+            row.goal = None
+
+    def _update_scrollregion(self):
+        """根据目标数量设置滚动区域"""
+        self.canvas.configure(scrollregion=(0, 0, self.width, len(self.items) * self.ROW_HEIGHT))
+
+    def scroll(self, units):
+        """按行滚动"""
+        self.canvas.yview_scroll(units, 'units')
+
+    def _on_yscroll(self, first, last):
+        """画布视图变化（滚动、缩放、滚动区域变化）时更新滚动条和可见行"""
+        self.scrollbar.set(first, last)
+        self._layout()
+
+    def _on_configure(self, event):
+        """画布尺寸变化时调整行宽和行池大小"""
+        self.width = event.width
+        self._update_scrollregion()
+        for row in self.rows:
+            self.canvas.itemconfigure(row.window, width=self.width)
+        self._layout()
+
+    def _pool_size(self):
+        """行池大小只取决于视口高度"""
+        height = max(self.canvas.winfo_height(), self.ROW_HEIGHT)
+        return height // self.ROW_HEIGHT + 2 + 2 * self.OVERSCAN
+
+    def _layout(self):
+        """把行池中的控件放到当前可见的行号上"""
+        size = self._pool_size()
+        while len(self.rows) < size:
+            row = GoalRow(self)
+            self.canvas.itemconfigure(row.window, width=self.width, height=self.ROW_HEIGHT)
+            self.rows.append(row)
+
+        top = int(self.canvas.canvasy(0))
+        height = self.canvas.winfo_height()
+        start = max(0, top // self.ROW_HEIGHT - self.OVERSCAN)
+        end = min(len(self.items), (top + height) // self.ROW_HEIGHT + 1 + self.OVERSCAN)
+        end = min(end, start + len(self.rows))
+
+        # 行号按行池大小取模映射到固定的行，滚动时只有新进入视口的行需要重新填充
+        visible = set()
+        theme = self.app.current_theme
+        for index in range(start, end):
+            row = self.rows[index % len(self.rows)]
+            visible.add(id(row))
+            goal = self.items[index]
+            if row.goal is not goal or row.index != index:
+                self._release(row)
+                row.bind_goal(goal, theme)
+                self.rows_by_goal[goal_key(goal)] = row
+                self.canvas.coords(row.window, 0, index * self.ROW_HEIGHT)
+                self.canvas.itemconfigure(row.window, state='normal')
+                row.index = index
+        for row in self.rows:
+            if id(row) not in visible and row.index != -1:
+                self.canvas.itemconfigure(row.window, state='hidden')
+                self.canvas.coords(row.window, 0, -2 * self.ROW_HEIGHT)
+                self._release(row)
+                row.goal = None
+                row.index = -1
+
+    def _release(self, row):
+        """解除行与其旧目标的映射（该目标可能已经被别的行接管）"""
+        if row.goal is not None and self.rows_by_goal.get(goal_key(row.goal)) is row:
+            del self.rows_by_goal[goal_key(row.goal)]
+
+class Timer:
+    """调度器中的一个定时任务"""
+    def __init__(self, deadline, callback, name):
+        self.deadline = deadline
+        self.callback = callback
+        self.name = name
+        self.cancelled = False
+
+class TimerScheduler:
+    """统一定时器：所有定时任务放在一个按到期时间排序的优先队列里，
+    只在最早到期的任务上挂一个 Tk after 回调，没有任务时不唤醒事件循环"""
+    def __init__(self, root):
+        self.root = root
+        self.queue = []  # (到期时间, 序号, Timer)
+        self.counter = itertools.count()
+        self.after_id = None
+        self.armed_deadline = None
+
+    def schedule(self, delay, callback, name=''):
+        """delay 秒后执行 callback，返回可用于取消的 Timer"""
+        timer = Timer(time.monotonic() + delay, callback, name)
+        heapq.heappush(self.queue, (timer.deadline, next(self.counter), timer))
+        self._arm()
+        return timer
+
+    def cancel(self, timer):
+        """取消定时任务（可以传入 None）"""
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self._arm()
+
+    def _arm(self):
+        """让唯一的 after 回调对准队列中最早到期的任务"""
+        while self.queue and self.queue[0][2].cancelled:
+            heapq.heappop(self.queue)
+        deadline = self.queue[0][0] if self.queue else None
+        if deadline == self.armed_deadline and (deadline is None or self.after_id is not None):
+            return
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.armed_deadline = deadline
+        if deadline is not None:
+            delay_ms = max(0, math.ceil((deadline - time.monotonic()) * 1000))
+            self.after_id = self.root.after(delay_ms, self._fire)
+
+    def _fire(self):
+        """执行所有已到期的任务，然后重新挂载 after 回调"""
+        self.after_id = None
+        self.armed_deadline = None
+        now = time.monotonic()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, timer = heapq.heappop(self.queue)
+            if timer.cancelled:
+                continue
+            timer.cancelled = True  # 已执行，之后再取消不会产生影响
+            try:
+                timer.callback()
+            except Exception as e:
+                logger.error(f'定时任务执行失败: {timer.name}, 错误: {str(e)}', exc_info=True)
+        self._arm()
+
+class MotionCoalescer:
+    """鼠标移动事件合并：高回报率鼠标每帧会产生多个移动事件，这里每个键只保留最新一次的处理，
+    由唯一的 after 回调每帧（约 16ms）统一执行一次"""
+    FRAME_MS = 16
+
+    def __init__(self, root):
+        self.root = root
+        self.pending = {}  # 键 -> (回调, 参数)，同一个键后到的覆盖先到的
+        self.after_id = None
+
+    def submit(self, key, callback, *args):
+        """登记一次处理，在下一帧执行（同一帧内同一个键只执行最后一次）"""
+        self.pending[key] = (callback, args)
+        if self.after_id is None:
+            self.after_id = self.root.after(self.FRAME_MS, self.flush)
+
+    def flush(self):
+        """立即执行所有待处理的回调（松开鼠标时调用，窗口停在最后的位置）"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        pending, self.pending = self.pending, {}
+        for callback, args in pending.values():
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f'处理鼠标移动失败: {str(e)}', exc_info=True)
+
+class StallWatchdog:
+    """事件循环卡顿监视：定时发出心跳，心跳迟到超过阈值即记为一次卡顿，
+    并从 log_operation 的执行记录中找出卡顿期间在执行的操作"""
+    INTERVAL = 0.1  # 心跳间隔（秒）
+
+    def __init__(self, app, threshold_ms=200, path='stalls.log'):
+        self.app = app
+        self.threshold = threshold_ms / 1000
+        self.path = path
+        self.expected = None
+        self.timer = None
+
+    def start(self):
+        """开始发送心跳"""
+        logger.info(f'卡顿监视已启用，阈值 {self.threshold * 1000:.0f}ms，记录写入 {self.path}')
+        self._schedule()
+
+    def stop(self):
+        """停止发送心跳"""
+        self.app.scheduler.cancel(self.timer)
+        self.timer = None
+
+    def _schedule(self):
+        """安排下一次心跳"""
+        self.expected = time.perf_counter() + self.INTERVAL
+        self.timer = self.app.scheduler.schedule(self.INTERVAL, self._beat, 'watchdog')
+
+    def _beat(self):
+        """心跳：计算迟到时间，超过阈值时记录卡顿"""
+        now = time.perf_counter()
+        lateness = now - self.expected
+        if lateness >= self.threshold:
+            self._report(self.expected, now, lateness)
+        self._schedule()
+
+    def _report(self, stall_start, stall_end, lateness):
+        """记录一次卡顿及其间执行的操作"""
+        operations = [
+            {'name': name, 'duration_ms': round((end - start) * 1000, 1)}
+            for name, start, end in operation_trace
+            if end > stall_start and start < stall_end
+        ]
+        operations += [{'name': name, 'duration_ms': None} for name in active_operations]
+        operations.sort(key=lambda op: -(op['duration_ms'] or 0))
+        record = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'stall_ms': round(lateness * 1000, 1),
+            'category': self.app.current_category,
+            'category_goals': self.app.model.goal_counters(self.app.current_category).total,
+            'operations': operations
+        }
+        names = ', '.join(op['name'] for op in operations) or '未知'
+        logger.warning(f'界面卡顿 {record["stall_ms"]}ms，期间操作: {names}')
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except Exception as e:
+            logger.error(f'写入卡顿记录失败: {str(e)}')
 
 class GoalTracker:
     def __init__(self):
-        # 初始化主窗口
+        # 分阶段启动：先显示窗口和标题栏，数据文件由后台线程读取后通过队列交给界面线程
+        self.startup_marks = {}  # 阶段 -> 距进程启动的毫秒数
+        self.startup_queue = queue.Queue()
+        self.startup_pending = {'languages', 'goals'}
+        self.ready = False
+        
+        # 初始化主窗口（语言文件读取完成后再设置标题）
         self.root = tk.Tk()
-        self.lang = Language()
-        self.root.title(self.lang.get_text('app_title'))
+        self.lang = Language(languages={})
         logger.info('启动目标管理器')
         
         # 设置窗口图标（如果存在）
@@ -113,23 +2405,55 @@ class GoalTracker:
             except:
                 pass
         
-        # 初始化主题
+        # 初始化主题（控件通过注册表登记颜色角色，切换主题时统一重新着色）
         self.current_theme = Theme.LIGHT
+        self.themes = ThemeRegistry(self.current_theme)
         
         # 设置窗口样式
         self.root.overrideredirect(True)  # 无边框
         self.root.attributes('-topmost', True)  # 置顶
-        self.root.configure(bg=self.current_theme['bg'])
+        self.themes.register(self.root, bg='bg')
         
         # 设置窗口初始位置和大小
         self.root.geometry('300x520+100+100')
         
+        # 统一定时器（空闲检测、语录轮播等都通过它调度）
+        self.scheduler = TimerScheduler(self.root)
+        self.idle_timer = None
+        self.quote_timer = None
+        
+        # 拖动和悬停的鼠标移动事件按帧合并处理
+        self.motion = MotionCoalescer(self.root)
+        self.screen_size = None  # 屏幕尺寸缓存，每次开始拖动时刷新
+        
         # 初始化拖动变量
         self.drag_data = {'x': 0, 'y': 0, 'dragging': False}
         
         # 数据文件路径
         self.data_file = 'goals.json'
-        self.quotes_file = 'quotes.json'
+        self.quotes_file = 'quotes.txt'
+        self.legacy_quotes_file = 'quotes.json'  # 旧版本的语录文件，首次使用时迁移
+        self.latency_report_file = 'latency_stats.json'
+        self.archive_dir = 'archives'  # 已结束周期的归档目录
+        self.archive = None
+        self.rollover_timer = None
+        self.reload_interval = 2  # 检查数据文件是否被其他程序修改的间隔（秒）
+        self.reload_timer = None
+        self.is_shut_down = False
+        
+        # 设置与存储方式（settings.json 中 "storage": "json"、"journal" 或 "sqlite"）
+        self.settings = self.load_settings()
+        if 'log_level' in self.settings and 'MYTARGET_LOG_LEVEL' not in os.environ:
+            try:
+                logging.getLogger().setLevel(str(self.settings['log_level']).upper())
+            except ValueError:
+                logger.warning(f'无效的日志级别: {self.settings["log_level"]}')
+        self.storage = self.create_storage()
+        
+        # 性能分析（可选）：环境变量 MYTARGET_PROFILE 或 settings.json 中 "profile" 指定的操作用 cProfile 包装
+        self.profile_dir = 'profiles'
+        self.profiling = False
+        self.enable_profiling()
         
         # 当前选中的分类
         self.current_category = 'weekly'
@@ -139,55 +2463,134 @@ class GoalTracker:
         self.last_activity_time = time.time()
         self.activity_timeout = 10  # 10秒无活动后最小化
         self.current_quote_index = 0
-        self.quotes = self.load_quotes()
+        self.quotes = None  # 首次进入横幅模式时才加载
         
-        # 初始化目标数据
-        self.goals = self.load_data()
+        # 目标数据模型（数据模型负责排序、统计和持久化，界面只监听变化）
+        self.model = GoalModel(self.storage, persist=self.save_data)
+        self.model.listeners.append(self._on_model_change)
         
-        # 创建界面
-        self.create_widgets()
+        # 第一阶段：只创建标题栏，窗口立即可见
+        self.main_widgets = []
+        self.create_title_bar()
+        self.bind_drag_events()
+        self.title_bar.bind('<Map>', lambda e: self.mark_startup('first_paint'), add='+')
+        self.mark_startup('window')
         
-        # 更新日期范围
+        # 第二阶段：后台并行读取语言文件和目标数据，读取完成后再创建其余界面
+        self.load_in_background('languages', self.lang.load_languages)
+        self.load_in_background('goals', self.load_data)
+        self.scheduler.schedule(0.01, self.poll_startup, 'startup')
+
+    def mark_startup(self, stage):
+        """记录启动阶段的完成时间（同一阶段只记第一次）"""
+        self.startup_marks.setdefault(stage, round((time.perf_counter() - PROCESS_START) * 1000, 1))
+
+    def load_in_background(self, name, loader):
+        """在后台线程中读取数据文件，结果通过队列交给界面线程（后台线程不访问任何控件）"""
+        def run():
+            start = time.perf_counter()
+            try:
+                result = loader()
+            except Exception as e:
+                logger.error(f'后台读取失败: {name}, 错误: {str(e)}')
+                result = None
+            self.startup_queue.put((name, result, time.perf_counter() - start))
+        threading.Thread(target=run, name=f'load-{name}', daemon=True).start()
+
+    def poll_startup(self):
+        """在界面线程中接收后台读取的结果，全部到齐后完成启动"""
+        while True:
+            try:
+                name, result, seconds = self.startup_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.startup_marks[f'{name}_read'] = round(seconds * 1000, 1)
+            self.startup_pending.discard(name)
+            if name == 'languages':
+                self.lang.languages = result or {}
+                self.root.title(self.lang.get_text('app_title'))
+            elif name == 'goals':
+                # 读取在后台线程中进行，不经过 log_operation（它的调用栈属于界面线程），耗时在这里计入直方图
+                operation_latency.setdefault('load_data', LatencyHistogram()).record(seconds)
+                if result is None:
+                    # 数据文件存在但无法读取：不能用默认数据覆盖它，提示后退出
+                    messagebox.showerror(
+                        "错误", "无法读取目标数据，详细信息见 app.log。\n"
+                                "为避免覆盖已有数据，程序将退出；请修复或移走数据文件后重新启动。")
+                    self.root.destroy()
+                    return
+                self.model.set_goals(result)
+        if self.startup_pending:
+            self.scheduler.schedule(0.01, self.poll_startup, 'startup')
+        else:
+            self.finish_startup()
+
+    def finish_startup(self):
+        """第三阶段：数据到齐后创建其余界面、渲染列表并启动各项检测"""
+        # 先结转已结束的周期，列表只渲染一次
+        self.archive = GoalArchive(self.archive_dir)
+        self.rollover_periods()
+        self.create_body()
         self.update_date_range()
+        self.create_context_menu()
+        self.ready = True
+        self.mark_startup('ready')
         
-        # 绑定拖动事件
-        self.bind_drag_events()
+        # Ctrl+Shift+L 导出各操作的耗时统计
+        self.root.bind('<Control-L>', self.dump_latency_stats)
         
-        # 创建右键菜单
-        self.create_context_menu()
+        # Ctrl+Z 撤销、Ctrl+Y 重做
+        self.root.bind('<Control-z>', self.undo)
+        self.root.bind('<Control-y>', self.redo)
+        
+        # 卡顿监视（可选）：环境变量 MYTARGET_WATCHDOG=1 或 settings.json 中 "watchdog": true
+        self.watchdog = None
+        if os.environ.get('MYTARGET_WATCHDOG') == '1' or self.settings.get('watchdog'):
+            self.watchdog = StallWatchdog(self, self.settings.get('watchdog_threshold_ms', 200))
+            self.watchdog.start()
+        
+        # 启动活动检测：空闲截止时间由操作事件设定，到期才检查
+        self.reset_activity_timer()
         
-        # 启动活动检测
-        self.check_activity()
+        # 监视其他程序（如同步工具）对数据文件的修改
+        if self.storage.LIVE_RELOAD:
+            self.reload_timer = self.scheduler.schedule(self.reload_interval, self.check_data_file, 'reload')
         
-        # 启动滚动显示
-        self.scroll_quote()
+        # 列表在事件循环空闲时绘制，之后再输出启动耗时报告
+        self.root.after_idle(self.report_startup)
+
+    def report_startup(self):
+        """输出启动耗时报告（各阶段距进程启动的毫秒数，以及后台读取各文件的耗时）"""
+        self.mark_startup('list_paint')
+        logger.info('启动耗时(ms): ' + ', '.join(f'{stage}={ms}' for stage, ms in self.startup_marks.items()))
 
     def load_quotes(self):
-        """加载励志语录"""
+        """打开励志语录（只读取偏移索引）"""
+        store = QuoteStore(self.quotes_file)
         try:
-            if os.path.exists(self.quotes_file):
-                with open(self.quotes_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('quotes', [])
-            return []
+            return store.open(self.legacy_quotes_file)
         except Exception as e:
             logger.error(f"加载励志语录失败: {str(e)}")
-            return []
+            return store
 
-    def save_quotes(self):
-        """保存励志语录"""
+    def current_quote(self):
+        """当前显示的语录"""
         try:
-            with open(self.quotes_file, 'w', encoding='utf-8') as f:
-                json.dump({'quotes': self.quotes}, f, ensure_ascii=False, indent=4)
+            return self.quotes.get(self.current_quote_index)
         except Exception as e:
-            logger.error(f"保存励志语录失败: {str(e)}")
+            logger.error(f"读取励志语录失败: {str(e)}")
+            return ""
 
     def check_activity(self):
-        """检查用户活动"""
-        current_time = time.time()
-        if not self.is_minimized and current_time - self.last_activity_time > self.activity_timeout:
+        """空闲截止时间到达：确认确实无操作后切换为横幅模式，否则按剩余时间重新设定"""
+        self.idle_timer = None
+        if self.is_minimized:
+            return
+        remaining = self.activity_timeout - (time.time() - self.last_activity_time)
+        if remaining > 0:
+            self.idle_timer = self.scheduler.schedule(remaining, self.check_activity, 'idle')
+        else:
             self.minimize_window()
-        self.root.after(1000, self.check_activity)  # 每秒检查一次
 
     def minimize_window(self):
         """最小化窗口为横幅模式"""
@@ -201,6 +2604,10 @@ class GoalTracker:
             self.hide_main_widgets()
             self.show_banner_widgets()
             self.is_minimized = True
+            # 语录只在横幅模式下轮播
+            self.scheduler.cancel(self.idle_timer)
+            self.idle_timer = None
+            self.quote_timer = self.scheduler.schedule(3, self.scroll_quote, 'quote')
 
     def restore_window(self):
         """恢复正常窗口"""
@@ -210,7 +2617,9 @@ class GoalTracker:
             self.show_main_widgets()
             self.hide_banner_widgets()
             self.is_minimized = False
-            self.last_activity_time = time.time()
+            self.scheduler.cancel(self.quote_timer)
+            self.quote_timer = None
+            self.reset_activity_timer()
 
     def hide_main_widgets(self):
         """隐藏主界面组件"""
@@ -219,6 +2628,9 @@ class GoalTracker:
 
     def show_main_widgets(self):
         """显示主界面组件"""
+        # 旧的组件会重新创建，先销毁以释放控件和主题登记
+        for widget in self.main_widgets:
+            widget.destroy()
         self.create_widgets()
         # 重新绑定拖动事件
         self.bind_drag_events()
@@ -227,27 +2639,32 @@ class GoalTracker:
 
     def show_banner_widgets(self):
         """显示横幅模式组件"""
-        self.banner_frame = tk.Frame(self.root, bg=self.current_theme['primary'], height=30)
+        # 励志语录只在横幅模式下显示，首次进入时才读取
+        if self.quotes is None:
+            self.quotes = self.load_quotes()
+            if len(self.quotes):
+                self.current_quote_index = random.randrange(len(self.quotes))
+        self.banner_frame = self.themes.register(tk.Frame(self.root, height=30), bg='primary')
         self.banner_frame.pack(fill='x')
         self.banner_frame.grid_columnconfigure(1, weight=1)  # 让语录标签可以扩展
         
-        # 计算待办事项数量
-        todo_count = sum(1 for goals in self.goals.values() for goal in goals if not goal['completed'])
+        # 待办事项数量直接读取各分类的计数器
+        todo_count = self.model.todo_count()
         
         # 待办数量标签
         todo_label = tk.Label(self.banner_frame,
                             text=f"待办{todo_count}",
-                            bg=self.current_theme['primary'],
                             fg='white',
                             font=('微软雅黑', 10))
+        self.themes.register(todo_label, bg='primary')
         todo_label.grid(row=0, column=0, padx=10, pady=5)
         
         # 励志语录标签
         self.quote_label = tk.Label(self.banner_frame, 
-                                  text=self.quotes[self.current_quote_index] if self.quotes else "添加你的励志语录",
-                                  bg=self.current_theme['primary'],
+                                  text=self.current_quote() if len(self.quotes) else "添加你的励志语录",
                                   fg='white',
                                   font=('微软雅黑', 10))
+        self.themes.register(self.quote_label, bg='primary')
         self.quote_label.grid(row=0, column=1, pady=5, sticky='ew')
         
         # 绑定鼠标事件 - 改为双击恢复窗口
@@ -264,12 +2681,17 @@ class GoalTracker:
             self.banner_frame.destroy()
 
     def scroll_quote(self):
-        """滚动显示励志语录"""
-        if self.is_minimized and self.quotes:
-            self.current_quote_index = (self.current_quote_index + 1) % len(self.quotes)
+        """滚动显示励志语录（仅在横幅模式下调度）"""
+        self.quote_timer = None
+        if not self.is_minimized:
+            return
+        if len(self.quotes) > 1:
+            # 按索引随机选取另一条语录，只读取这一行
+            index = random.randrange(len(self.quotes) - 1)
+            self.current_quote_index = index + (index >= self.current_quote_index)
             if hasattr(self, 'quote_label'):
-                self.quote_label.config(text=self.quotes[self.current_quote_index])
-        self.root.after(3000, self.scroll_quote)  # 每3秒切换一次
+                self.quote_label.config(text=self.current_quote())
+        self.quote_timer = self.scheduler.schedule(3, self.scroll_quote, 'quote')  # 每3秒切换一次
 
     def show_quote_menu(self, event):
         """显示励志语录右键菜单"""
@@ -279,27 +2701,61 @@ class GoalTracker:
         menu.post(event.x_root, event.y_root)
 
     def edit_quotes(self):
-        """编辑励志语录"""
+        """分页编辑励志语录：每页只读取一页，保存时只替换这一页"""
+        if self.quotes is None:
+            self.quotes = self.load_quotes()
         edit_window = tk.Toplevel(self.root)
         edit_window.title("编辑励志语录")
         edit_window.geometry("400x300")
         
         text = tk.Text(edit_window, font=('微软雅黑', 10))
-        text.pack(fill='both', expand=True, padx=10, pady=10)
+        text.pack(fill='both', expand=True, padx=10, pady=(10, 0))
+        
+        nav_frame = tk.Frame(edit_window)
+        nav_frame.pack(pady=10)
+        page_label = tk.Label(nav_frame, font=('微软雅黑', 10))
+        state = {'page': 0}
+        
+        def page_count():
+            return max(1, math.ceil(len(self.quotes) / QUOTE_PAGE_SIZE))
+        
+        def show_page(page):
+            state['page'] = page
+            text.delete('1.0', 'end')
+            text.insert('1.0', '\n'.join(self.quotes.page(page * QUOTE_PAGE_SIZE, QUOTE_PAGE_SIZE)))
+            text.edit_modified(False)
+            page_label.config(text=f"{page + 1}/{page_count()}")
+        
+        def save_page():
+            # 没有修改的页不写文件
+            if not text.edit_modified():
+                return
+            content = text.get('1.0', 'end-1c')
+            quotes = [q.strip() for q in content.split('\n') if q.strip()]
+            try:
+                self.quotes.replace_page(state['page'] * QUOTE_PAGE_SIZE, QUOTE_PAGE_SIZE, quotes)
+            except Exception as e:
+                logger.error(f"保存励志语录失败: {str(e)}")
+            text.edit_modified(False)
         
-        # 显示当前语录
-        text.insert('1.0', '\n'.join(self.quotes))
+        def turn_page(step):
+            save_page()
+            show_page(min(max(state['page'] + step, 0), page_count() - 1))
         
         def save():
-            content = text.get('1.0', 'end-1c')
-            self.quotes = [q.strip() for q in content.split('\n') if q.strip()]
-            self.save_quotes()
+            save_page()
             edit_window.destroy()
         
-        tk.Button(edit_window, text="保存", command=save).pack(pady=10)
+        tk.Button(nav_frame, text="◀", command=lambda: turn_page(-1)).pack(side='left', padx=5)
+        page_label.pack(side='left', padx=5)
+        tk.Button(nav_frame, text="▶", command=lambda: turn_page(1)).pack(side='left', padx=5)
+        tk.Button(nav_frame, text="保存", command=save).pack(side='left', padx=15)
+        show_page(0)
 
     def add_quote(self):
         """添加新的励志语录"""
+        if self.quotes is None:
+            self.quotes = self.load_quotes()
         add_window = tk.Toplevel(self.root)
         add_window.title("添加励志语录")
         add_window.geometry("400x100")
@@ -310,8 +2766,11 @@ class GoalTracker:
         def save():
             quote = entry.get().strip()
             if quote:
-                self.quotes.append(quote)
-                self.save_quotes()
+                # 只向语录文件追加一行
+                try:
+                    self.quotes.append(quote)
+                except Exception as e:
+                    logger.error(f"保存励志语录失败: {str(e)}")
             add_window.destroy()
         
         tk.Button(add_window, text="添加", command=save).pack(pady=10)
@@ -320,93 +2779,86 @@ class GoalTracker:
         """创建界面组件"""
         # 存主界面组件引用
         self.main_widgets = []
-        
-        # 绑定全局鼠标事件
-        self.root.bind('<Button-1>', lambda e: self.reset_activity_timer())
-        self.root.bind('<Button-3>', lambda e: self.reset_activity_timer())
-        self.root.bind('<B1-Motion>', lambda e: self.reset_activity_timer())
-        self.root.bind('<MouseWheel>', lambda e: self.reset_activity_timer())
-        
+        self.create_title_bar()
+        self.create_body()
+
+    def create_title_bar(self):
+        """创建标题栏（启动时最先显示）"""
         # 标题栏（用于拖动）
-        self.title_bar = tk.Frame(self.root, bg=self.current_theme['primary'], height=40)
+        self.title_bar = self.themes.register(tk.Frame(self.root, height=40), bg='primary')
         self.title_bar.pack(fill='x', pady=(0, 5))
         self.main_widgets.append(self.title_bar)
         
         # Logo和标题
-        title_label = tk.Label(self.title_bar, text='📋 我的T', bg=self.current_theme['primary'],
+        title_label = tk.Label(self.title_bar, text='📋 我的T',
                               fg='white', font=('微软雅黑', 12, 'bold'))
+        self.themes.register(title_label, bg='primary')
         title_label.pack(side='left', padx=10, pady=5)
         
         # 主题切换按钮
-        theme_btn = tk.Label(self.title_bar, text='🌓', bg=self.current_theme['primary'],
+        theme_btn = tk.Label(self.title_bar, text='🌓',
                             fg='white', font=('Arial', 12), cursor='hand2')
+        self.themes.register(theme_btn, bg='primary')
         theme_btn.pack(side='right', padx=5, pady=5)
         theme_btn.bind('<Button-1>', self.toggle_theme)
         
         # 语言切换按钮
-        lang_btn = tk.Label(self.title_bar, text='🌐', bg=self.current_theme['primary'],
+        lang_btn = tk.Label(self.title_bar, text='🌐',
                           fg='white', font=('Arial', 12), cursor='hand2')
+        self.themes.register(lang_btn, bg='primary')
         lang_btn.pack(side='right', padx=5, pady=5)
         lang_btn.bind('<Button-1>', self.toggle_language)
         
         # 关闭按钮
-        close_btn = tk.Label(self.title_bar, text='×', bg=self.current_theme['primary'],
+        close_btn = tk.Label(self.title_bar, text='×',
                             fg='white', font=('Arial', 16, 'bold'), cursor='hand2')
+        self.themes.register(close_btn, bg='primary')
         close_btn.pack(side='right', padx=5, pady=5)
         close_btn.bind('<Button-1>', self.quit_app)
         
+        # 右键标题栏：导入、导出
+        for widget in [self.title_bar, title_label]:
+            widget.bind('<Button-3>', self.show_title_menu)
+        
+        # 历史目标按钮
+        history_btn = tk.Label(self.title_bar, text='🕘',
+                              fg='white', font=('Arial', 12), cursor='hand2')
+        self.themes.register(history_btn, bg='primary')
+        history_btn.pack(side='right', padx=5, pady=5)
+        history_btn.bind('<Button-1>', self.show_history)
+
+    def create_body(self):
+        """创建标题栏以下的界面组件并显示目标列表"""
+        # 绑定全局鼠标事件
+        self.root.bind('<Button-1>', lambda e: self.reset_activity_timer())
+        self.root.bind('<Button-3>', lambda e: self.reset_activity_timer())
+        self.root.bind('<B1-Motion>', lambda e: self.reset_activity_timer())
+        self.root.bind('<MouseWheel>', lambda e: self.reset_activity_timer())
+        
         # 分类标签框架
-        category_frame = tk.Frame(self.root, bg=self.current_theme['bg'])
+        category_frame = self.themes.register(tk.Frame(self.root), bg='bg')
         category_frame.pack(fill='x', padx=10, pady=5)
         self.main_widgets.append(category_frame)
         
         # 分类按钮容器（用于居中对齐）
-        buttons_container = tk.Frame(category_frame, bg=self.current_theme['bg'])
-        buttons_container.pack(expand=True)
-        
-        # 统一的按钮样式
-        button_width = 8  # 统一宽度
-        button_style = {
-            'font': ('微软雅黑', 10),
-            'width': button_width,
-            'height': 1,
-            'bd': 0,
-            'cursor': 'hand2',
-            'relief': 'flat'
-        }
-        
-        # 分类按钮
-        self.weekly_btn = tk.Button(buttons_container, text='本周',
-                                   command=lambda: self.switch_category('weekly'),
-                                   **button_style)
-        self.weekly_btn.pack(side='left', padx=2)
-        
-        self.monthly_btn = tk.Button(buttons_container, text='本月',
-                                    command=lambda: self.switch_category('monthly'),
-                                    **button_style)
-        self.monthly_btn.pack(side='left', padx=2)
-        
-        self.yearly_btn = tk.Button(buttons_container, text='本年',
-                                   command=lambda: self.switch_category('yearly'),
-                                   **button_style)
-        self.yearly_btn.pack(side='left', padx=2)
-        
-        # 更新分类按钮状态
-        self.update_category_buttons()
+        self.category_container = self.themes.register(tk.Frame(category_frame), bg='bg')
+        self.category_container.pack(expand=True)
+        self.category_buttons = {}  # 列表名 -> 按钮
+        self.create_category_buttons()
         
         # 日期范围标签
-        self.date_label = tk.Label(self.root, text='', bg=self.current_theme['bg'],
-                                  fg=self.current_theme['fg'], font=('微软雅黑', 9))
+        self.date_label = tk.Label(self.root, text='', font=('微软雅黑', 9))
+        self.themes.register(self.date_label, bg='bg', fg='fg')
         self.date_label.pack(pady=5)
         self.main_widgets.append(self.date_label)
         
         # 优先级选择框架
-        priority_frame = tk.Frame(self.root, bg=self.current_theme['bg'])
+        priority_frame = self.themes.register(tk.Frame(self.root), bg='bg')
         priority_frame.pack(fill='x', padx=10, pady=5)
         self.main_widgets.append(priority_frame)
         
         # 优先级单选按钮容器（用于居中对齐）
-        priority_container = tk.Frame(priority_frame, bg=self.current_theme['bg'])
+        priority_container = self.themes.register(tk.Frame(priority_frame), bg='bg')
         priority_container.pack(expand=True)
         
         # 优先级单选按钮
@@ -420,54 +2872,69 @@ class GoalTracker:
         for text, value, icon in priorities:
             rb = tk.Radiobutton(priority_container, text=f'{icon} {text}',
                                variable=self.priority_var, value=value,
-                               bg=self.current_theme['bg'],
-                               fg=self.current_theme['fg'],
-                               selectcolor=self.current_theme['bg'],
                                font=('微软雅黑', 10))
+            self.themes.register(rb, bg='bg', fg='fg', selectcolor='bg')
             rb.pack(side='left', padx=10)
         
         # 输入框和添加按钮框架
-        input_frame = tk.Frame(self.root, bg=self.current_theme['bg'])
+        input_frame = self.themes.register(tk.Frame(self.root), bg='bg')
         input_frame.pack(fill='x', padx=10, pady=5)
         self.main_widgets.append(input_frame)
         
         # 输入框
-        self.entry = tk.Entry(input_frame, font=('微软雅黑', 10),
-                             bg=self.current_theme['secondary_bg'],
-                             fg=self.current_theme['fg'],
-                             insertbackground=self.current_theme['fg'])
+        self.entry = tk.Entry(input_frame, font=('微软雅黑', 10))
+        self.themes.register(self.entry, bg='secondary_bg', fg='fg', insertbackground='fg')
         self.entry.pack(side='left', fill='x', expand=True, padx=(0, 5))
         self.entry.bind('<Key>', lambda e: self.reset_activity_timer())  # 添加键盘事件监听
         
         # 添加按钮
         add_btn = tk.Button(input_frame, text='添加', command=self.add_goal,
-                           font=('微软雅黑', 10), bg=self.current_theme['primary'],
+                           font=('微软雅黑', 10),
                            fg='white', bd=0, padx=15, cursor='hand2')
+        self.themes.register(add_btn, bg='primary')
         add_btn.pack(side='right')
         
+        # 搜索框：输入时即时显示所有分类中匹配的目标，清空（或按 Esc）后恢复当前分类
+        search_frame = self.themes.register(tk.Frame(self.root), bg='bg')
+        search_frame.pack(fill='x', padx=10, pady=(0, 5))
+        self.main_widgets.append(search_frame)
+        
+        search_icon = tk.Label(search_frame, text='🔍', font=('微软雅黑', 10))
+        self.themes.register(search_icon, bg='bg', fg='fg')
+        search_icon.pack(side='left')
+        
+        self.search_query = ''
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var,
+                                     font=('微软雅黑', 10))
+        self.themes.register(self.search_entry, bg='secondary_bg', fg='fg', insertbackground='fg')
+        self.search_entry.pack(side='left', fill='x', expand=True, padx=(5, 0))
+        self.search_var.trace_add('write', lambda *args: self.on_search())
+        self.search_entry.bind('<Escape>', lambda e: self.search_var.set(''))
+        
         # 作者信息标签
-        author_frame = tk.Frame(self.root, bg=self.current_theme['bg'])
+        author_frame = self.themes.register(tk.Frame(self.root), bg='bg')
         author_frame.pack(fill='x', side='bottom', padx=10, pady=5)
         self.main_widgets.append(author_frame)
         
         author_label = tk.Label(author_frame, 
                               text='作者：A先生  QQ交流：3956582704',
-                              bg=self.current_theme['bg'],
-                              fg=self.current_theme['fg'],
                               font=('微软雅黑', 9))
+        self.themes.register(author_label, bg='bg', fg='fg')
         author_label.pack()
         
         # 目标列表框架
-        self.list_frame = tk.Frame(self.root, bg=self.current_theme['bg'])
+        self.list_frame = self.themes.register(tk.Frame(self.root), bg='bg')
         self.list_frame.pack(fill='both', expand=True, padx=10, pady=5)
         self.main_widgets.append(self.list_frame)
+        self._create_list_view()
         
         # 更新列表显示
         self.update_list()
 
     def _on_mousewheel(self, event):
         """处理鼠标滚轮事件"""
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.goal_list.scroll(int(-1*(event.delta/120)))
 
     def create_context_menu(self):
         """创建右键菜单"""
@@ -486,134 +2953,114 @@ class GoalTracker:
         self.selected_index = index
         self.context_menu.post(event.x_root, event.y_root)
 
-    @log_operation
-    def update_list(self):
-        """更新目标列表显示"""
-        # 清除现有列表
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-        
-        # 创建滚动画布
-        canvas = tk.Canvas(self.list_frame, bg=self.current_theme['bg'],
-                          highlightthickness=0)
-        scrollbar = ttk.Scrollbar(self.list_frame, orient='vertical',
-                                command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.current_theme['bg'])
-        
-        # 配置滚动
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        # 布局滚动组件
-        canvas.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # 创建窗口
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        
+    def _create_list_view(self):
+        """创建进度统计区域和虚拟化目标列表"""
         # 进度统计
-        completed, percentage = self.get_progress_stats()
-        stats_frame = tk.Frame(scrollable_frame, bg=self.current_theme['bg'])
+        stats_frame = self.themes.register(tk.Frame(self.list_frame), bg='bg')
         stats_frame.pack(fill='x', padx=5, pady=5)
-        
-        stats_label = tk.Label(stats_frame,
-                             text=f'完成进度: {completed}/{len(self.goals[self.current_category])} ({percentage:.1f}%)',
-                             bg=self.current_theme['bg'],
-                             fg=self.current_theme['fg'],
-                             font=('微软雅黑', 9))
-        stats_label.pack(side='left')
-        
+        self.stats_frame = stats_frame
+
+        self.stats_label = tk.Label(stats_frame,
+                                    text='',
+                                    font=('微软雅黑', 9))
+        self.themes.register(self.stats_label, bg='bg', fg='fg')
+        self.stats_label.pack(side='left')
+
         # 进度条
-        progress_frame = tk.Frame(scrollable_frame, bg=self.current_theme['border'],
-                                height=4)
-        progress_frame.pack(fill='x', padx=5, pady=(0, 10))
-        
-        if percentage > 0:
-            progress_bar = tk.Frame(progress_frame,
-                                  bg=self.current_theme['primary'],
-                                  height=4)
-            progress_bar.place(relwidth=percentage/100, rely=0, relheight=1)
-        
-        # 对目标列表进行排序
-        # 1. 未完成的排在前面
-        # 2. 按优先级排序（高>中>低）
-        priority_order = {'high': 0, 'medium': 1, 'low': 2}
-        sorted_goals = sorted(
-            self.goals[self.current_category],
-            key=lambda x: (
-                x['completed'],  # 首先按完成状态排序（False在前）
-                priority_order[x['priority']],  # 然后按优先级排序
-                x['text']  # 最后按文本内容排序
-            )
-        )
-        
-        # 显示目标列表
-        for i, goal in enumerate(sorted_goals):
-            # 目标项框架
-            item_frame = tk.Frame(scrollable_frame, bg=self.current_theme['bg'])
-            item_frame.pack(fill='x', padx=5, pady=2)
-            
-            # 配置鼠标悬停效果
-            item_frame.bind('<Enter>',
-                          lambda e, f=item_frame: f.configure(bg=self.current_theme['hover']))
-            item_frame.bind('<Leave>',
-                          lambda e, f=item_frame: f.configure(bg=self.current_theme['bg']))
-            
-            # 复选框
-            check_var = tk.BooleanVar(value=goal['completed'])
-            check = tk.Checkbutton(item_frame,
-                                 variable=check_var,
-                                 command=lambda g=goal, v=check_var: self.toggle_goal(g, v),
-                                 bg=self.current_theme['bg'],
-                                 activebackground=self.current_theme['bg'])
-            check.pack(side='left', padx=(5, 0))
-            
-            # 优先级图标
-            priority_colors = {
-                'high': self.current_theme['high_priority'],
-                'medium': self.current_theme['medium_priority'],
-                'low': self.current_theme['low_priority']
-            }
-            priority_icons = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
-            
-            priority_label = tk.Label(item_frame,
-                                    text=priority_icons[goal['priority']],
-                                    bg=self.current_theme['bg'],
-                                    fg=priority_colors[goal['priority']])
-            priority_label.pack(side='left', padx=5)
-            
-            # 目标文本
-            text_color = self.current_theme['completed_fg'] if goal['completed'] else self.current_theme['fg']
-            text_label = tk.Label(item_frame,
-                                text=goal['text'],
-                                bg=self.current_theme['bg'],
-                                fg=text_color,
-                                font=('微软雅黑', 10),
-                                anchor='w',
-                                justify='left')
-            text_label.pack(side='left', fill='x', expand=True, padx=5)
-            
-            # 绑定右键菜单
-            for widget in [item_frame, text_label]:
-                widget.bind('<Button-3>', lambda e, g=goal: self.show_goal_menu(e, g))
-        
+        self.progress_frame = self.themes.register(tk.Frame(self.list_frame, height=4),
+                                                   bg='border')
+        self.progress_frame.pack(fill='x', padx=5, pady=(0, 10))
+        self.progress_bar = self.themes.register(tk.Frame(self.progress_frame, height=4),
+                                                 bg='primary')
+
+        # 目标列表（只渲染可见行）
+        items_frame = self.themes.register(tk.Frame(self.list_frame), bg='bg')
+        items_frame.pack(fill='both', expand=True)
+        self.goal_list = VirtualGoalList(items_frame, self)
+        self.canvas = self.goal_list.canvas
+
         # 绑定鼠标滚轮事件
-        canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
-        
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+
+    def update_progress(self):
+        """更新进度统计文字和进度条"""
+        completed, percentage = self.get_progress_stats()
+        self.stats_label.configure(
+            text=f'完成进度: {completed}/{self.model.goal_counters(self.current_category).total} ({percentage:.1f}%)')
+        if percentage > 0:
+            self.progress_bar.place(relwidth=percentage/100, rely=0, relheight=1)
+        else:
+            self.progress_bar.place_forget()
+
+    @log_operation
+    def update_list(self):
+        """更新目标列表显示"""
+        # 进度统计
+        self.update_progress()
+
+        # 显示目标列表：只有视口内的行会创建或更新控件
+        self.goal_list.set_items(self.visible_goals())
+
         # 更新日期范围显示
         self.date_label.configure(text=self.get_date_range())
-        
+
         # 更新分类按钮状态
         self.update_category_buttons()
 
+    @property
+    def goals(self):
+        """目标数据（由数据模型持有）"""
+        return self.model.goals
+
+    def visible_goals(self):
+        """列表中显示的目标：搜索时为所有分类的匹配结果，否则为当前分类的有序索引"""
+        if self.search_query:
+            return [goal for category, goal in self.model.search_goals(self.search_query)]
+        # 有序索引在分类首次显示时建立，之后由增删改增量维护，刷新时不再排序
+        return self.model.sorted_index(self.current_category).goals
+
+    @log_operation
+    def on_search(self):
+        """搜索框内容变化：按全文索引查找，不遍历全部目标"""
+        self.reset_activity_timer()
+        self.search_query = self.search_var.get().strip()
+        self.canvas.yview_moveto(0)
+        self.goal_list.set_items(self.visible_goals())
+
+    def category_of(self, goal):
+        """目标所在的分类（搜索结果可能来自其他分类）"""
+        if self.search_query:
+            return self.model.search_index().category_of(goal)
+        return self.current_category
+
+    def _on_model_change(self, action, category, goal, old_key):
+        """数据变化后只修补当前分类中受影响的行，并更新统计"""
+        if not self.ready:
+            return
+        if action == 'categories':
+            # 新建或删除了列表：重建分类按钮，当前列表被删除时回到第一个列表
+            if category == self.current_category and category not in self.goals:
+                self.current_category = self.storage.category_names(self.goals)[0]
+                self.update_date_range()
+                self.update_list()
+            self.create_category_buttons()
+            return
+        if action == 'reset':
+            # 批量变化（周期结转、导入，category 为 None 表示涉及多个分类）：整体刷新一次
+            if self.search_query or category in (None, self.current_category):
+                self.update_list()
+            return
+        if self.search_query:
+            # 搜索结果是独立的列表，变化后重新查询（只查索引）
+            self.goal_list.set_items(self.visible_goals())
+        elif category == self.current_category:
+            self.goal_list.items_changed(goal if action != 'add' else None)
+        if category == self.current_category:
+            self.update_progress()
+
     def handle_checkbox_click(self, goal, var):
         """处理复选框点击事件"""
-        goal['completed'] = var.get()
-        status = "完成" if goal['completed'] else "未完成"
-        self.save_data()
-        self.update_list()
+        self.model.update_goal(self.category_of(goal), goal, completed=var.get())
 
     def bind_drag_events(self):
         """绑定拖动事件"""
@@ -630,109 +3077,161 @@ class GoalTracker:
         # 记录初始点击的全局坐标与窗口位置的偏移
         self.drag_data['offset_x'] = event.x_root - self.root.winfo_x()
         self.drag_data['offset_y'] = event.y_root - self.root.winfo_y()
+        
+        # 屏幕尺寸在拖动过程中不会变化，每次开始拖动时读取一次（显示器配置可能已改变）
+        self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
 
     def on_drag(self, event):
-        """拖动处理"""
+        """拖动处理：只记下最新的位置，由合并层每帧移动一次窗口"""
         if self.drag_data['dragging']:
-            # 获事件的全局坐标
-            x_root = event.x_root
-            y_root = event.y_root
-            
             # 计算新位置（使用偏移量）
-            x = x_root - self.drag_data['offset_x']
-            y = y_root - self.drag_data['offset_y']
-            
-            # 获取屏幕尺寸
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            
-            # 窗口尺寸
-            window_width = 300
-            window_height = 30 if self.is_minimized else 520
-            
-            # 确保窗口不会超出屏幕边界
-            x = max(0, min(x, screen_width - window_width))
-            y = max(0, min(y, screen_height - window_height))
-            
-            # 更新窗口位置
-            self.root.geometry(f'{window_width}x{window_height}+{x}+{y}')
+            x = event.x_root - self.drag_data['offset_x']
+            y = event.y_root - self.drag_data['offset_y']
+            self.motion.submit('drag', self.move_window, x, y)
+
+    def move_window(self, x, y):
+        """把窗口移动到 (x, y)，不超出屏幕"""
+        if self.screen_size is None:
+            self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        screen_width, screen_height = self.screen_size
+        
+        # 窗口尺寸
+        window_width = 300
+        window_height = 30 if self.is_minimized else 520
+        
+        # 确保窗口不会超出屏幕边界
+        x = max(0, min(x, screen_width - window_width))
+        y = max(0, min(y, screen_height - window_height))
+        
+        # 更新窗口位置
+        self.root.geometry(f'{window_width}x{window_height}+{x}+{y}')
 
     def stop_drag(self, event):
         """停止拖动"""
+        # 立即应用最后一次移动，窗口停在松开鼠标的位置
+        self.motion.flush()
         self.drag_data['dragging'] = False
 
-    @log_operation
-    def load_data(self):
-        """加载数据"""
+    def load_settings(self):
+        """加载设置"""
         try:
-            if os.path.exists('goals.json'):
-                with open('goals.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if data:
-                        logger.info('成功加载数据')
-                        return data
-                    else:
-                        logger.warning('数据文件为空，创建新的数据结构')
-                        return self._create_default_data()
-            else:
-                return self._create_default_data()
-        except Exception as e:
-            logger.error(f'数据加载失败: {str(e)}')
-            return self._create_default_data()
+            with open('settings.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
 
-    def _create_default_data(self):
-        """创建默认的数据结构"""
-        default_data = {
-            'weekly': [
-                {
-                    'text': '1.完成myshell商品上架',
-                    'completed': False,
-                    'priority': 'low'
-                },
-                {
-                    'text': '3.完成透明数据库系统',
-                    'completed': False,
-                    'priority': 'low'
-                },
-                {
-                    'text': '4.ai宣传视频模块制作',
-                    'completed': False,
-                    'priority': 'low'
-                },
-                {
-                    'text': '2.明年计划',
-                    'completed': False,
-                    'priority': 'medium'
-                }
-            ],
-            'monthly': [],
-            'yearly': []
-        }
+    def enable_profiling(self):
+        """用 cProfile 包装指定的操作，每次调用生成一个 .prof 文件"""
+        names = os.environ.get('MYTARGET_PROFILE') or self.settings.get('profile') or []
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(',') if name.strip()]
+        for name in names:
+            method = getattr(self, name, None)
+            if not callable(method):
+                logger.warning(f'无法分析未知的操作: {name}')
+                continue
+            setattr(self, name, self._profiled(name, method))
+            logger.info(f'已启用性能分析: {name}，结果写入 {self.profile_dir}/')
+
+    def _profiled(self, name, method):
+        """返回在 cProfile 下执行 method 的包装函数"""
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if self.profiling:
+                # 已在外层操作的分析中，直接执行
+                return method(*args, **kwargs)
+            category = self.current_category
+            profiler = cProfile.Profile()
+            self.profiling = True
+            try:
+                return profiler.runcall(method, *args, **kwargs)
+            finally:
+                self.profiling = False
+                self._dump_profile(profiler, name, category)
+        return wrapper
+
+    def _dump_profile(self, profiler, name, category):
+        """写出一次分析结果，文件名带上操作名、分类和该分类的目标数量"""
         try:
-            with open('goals.json', 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, ensure_ascii=False, indent=2)
-            logger.info('创建新的数据文件')
+            count = self.model.goal_counters(category).total
+        except Exception:
+            count = 'unknown'
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.profile_dir, f'{name}-{category}-{count}goals-{timestamp}.prof')
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(path)
+            logger.info(f'性能分析结果已写入 {path}')
         except Exception as e:
-            logger.error(f'创建数据文件失败: {str(e)}')
-        return default_data
+            logger.error(f'写入性能分析结果失败: {str(e)}')
+
+    def create_storage(self):
+        """根据设置创建存储后端"""
+        name = self.settings.get('storage', 'json')
+        if name not in STORAGE_BACKENDS:
+            logger.warning(f'未知的存储方式: {name}，使用 json')
+            name = 'json'
+        logger.info(f'使用存储方式: {name}')
+        if name == 'json' and self.settings.get('write_behind', True):
+            # 默认由后台线程合并写入，界面线程不访问磁盘
+            return WriteBehindStorage(self.data_file)
+        return STORAGE_BACKENDS[name](self.data_file)
+
+    def load_data(self):
+        """读取目标数据（启动时在后台线程中执行，结果交给界面线程后才放入数据模型）"""
+        return self.model.read()
 
     @log_operation
-    def save_data(self):
-        """保存数据"""
+    def save_data(self, op=None):
+        """保存数据；传入变更记录时由存储后端决定是否只追加这一条"""
         try:
-            with open('goals.json', 'w', encoding='utf-8') as f:
-                json.dump(self.goals, f, ensure_ascii=False, indent=2)
-            logger.info('数据保存成功')
+            self.model.write(op)
+            logger.debug('数据保存成功')
+        except WriteConflictError as e:
+            # 修改保留在内存中，合并外部修改后整体写入
+            logger.warning(str(e))
+            self.scheduler.cancel(self.reload_timer)
+            self.reload_timer = self.scheduler.schedule(0, self.check_data_file, 'reload')
         except Exception as e:
             logger.error(f'数据保存失败: {str(e)}')
             raise
 
+    def check_data_file(self):
+        """定时检查数据文件，被其他程序修改时合并进当前数据"""
+        self.reload_timer = None
+        try:
+            self.merge_external_changes()
+        except Exception as e:
+            logger.error(f'合并外部修改失败: {str(e)}', exc_info=True)
+        if not self.is_shut_down:
+            self.reload_timer = self.scheduler.schedule(self.reload_interval, self.check_data_file, 'reload')
+
+    @log_operation
+    def merge_external_changes(self):
+        """读取被其他程序修改的数据文件，按目标对比后只增删改受影响的目标"""
+        raw = self.storage.external_change()
+        if raw is None:
+            return
+        try:
+            # 不合法的内容不合并（可能是其他程序写到一半）
+            theirs = goals_from_json(json.loads(raw))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f'数据文件内容无效，暂不合并: {str(e)}')
+            return
+        conflicts = self.model.merge(self.storage.base or {}, theirs)
+        self.storage.accept_external(raw, theirs)
+        logger.info(f'已合并其他程序对 {self.data_file} 的修改')
+        if conflicts:
+            logger.warning(f'{conflicts} 个目标在本程序中也被修改或删除，保留本程序的版本')
+        # 当前数据包含本程序尚未写入的修改或冲突（或文件中缺少 id）时，合并结果整体写回
+        if goals_to_json(self.goals) != goals_to_json(theirs):
+            self.model.persist(None)
+
     def switch_category(self, category):
         """切换目标分类"""
         self.reset_activity_timer()  # 重置计时器
         self.current_category = category
-        category_names = {'weekly': '本周', 'monthly': '本月', 'yearly': '本年'}
-        logger.info(f'切换到{category_names[category]}目标列表')
+        logger.info(f'切换到{self.category_label(category)}目标列表')
         self.update_date_range()
         self.update_list()
 
@@ -747,6 +3246,7 @@ class GoalTracker:
             logger.error(f'程序异常退出: {str(e)}')
             raise
         finally:
+            self.shutdown()
             logger.info('关闭目标管理器')
 
     def show_goal_menu(self, event, goal):
@@ -775,7 +3275,7 @@ class GoalTracker:
         tk.Label(text_frame, text="目标内容:", bg=self.current_theme['bg'],
                 fg=self.current_theme['fg'], font=('微软雅黑', 10)).pack(anchor='w')
         
-        text_var = tk.StringVar(value=goal['text'])
+        text_var = tk.StringVar(value=goal.text)
         entry = tk.Entry(text_frame, textvariable=text_var,
                         font=('微软雅黑', 10),
                         bg=self.current_theme['secondary_bg'],
@@ -790,7 +3290,7 @@ class GoalTracker:
         tk.Label(priority_frame, text="优先级:", bg=self.current_theme['bg'],
                 fg=self.current_theme['fg'], font=('微软雅黑', 10)).pack(anchor='w')
         
-        priority_var = tk.StringVar(value=goal['priority'])
+        priority_var = tk.StringVar(value=goal.priority.label)
         priorities = [
             ('高', 'high', '🔴'),
             ('中', 'medium', '🟡'),
@@ -813,10 +3313,8 @@ class GoalTracker:
         def save_changes():
             new_text = text_var.get().strip()
             if new_text:
-                goal['text'] = new_text
-                goal['priority'] = priority_var.get()
-                self.save_data()
-                self.update_list()
+                self.model.update_goal(self.category_of(goal), goal,
+                                       text=new_text, priority=Priority.parse(priority_var.get()))
                 edit_window.destroy()
         
         # 保存按钮
@@ -837,60 +3335,51 @@ class GoalTracker:
             self.lang.get_text('dialog.confirm_delete'),
             self.lang.get_text('dialog.confirm_delete_message')
         ):
-            self.goals[self.current_category].remove(goal)
-            self.save_data()
-            self.update_list()
+            self.model.remove_goal(self.category_of(goal), goal)
+
+    @log_operation
+    def undo(self, event=None):
+        """撤销最近一次修改（与普通修改一样只保存和刷新受影响的目标）"""
+        self.reset_activity_timer()
+        if self.model.undo():
+            logger.info('撤销修改')
+
+    @log_operation
+    def redo(self, event=None):
+        """重做最近一次撤销的修改"""
+        self.reset_activity_timer()
+        if self.model.redo():
+            logger.info('重做修改')
 
     def toggle_goal(self, goal, check_var):
         """切换目标完成状态"""
         self.reset_activity_timer()  # 重置计时器
-        goal['completed'] = check_var.get()
-        self.save_data()
-        self.update_list()
+        self.model.update_goal(self.category_of(goal), goal, completed=check_var.get())
 
     def toggle_theme(self, event):
         """切换主题"""
         self.reset_activity_timer()  # 重置计时器
         new_theme = "深色" if self.current_theme == Theme.DARK else "浅色"
         self.current_theme = Theme.DARK if self.current_theme == Theme.LIGHT else Theme.LIGHT
-        self.root.configure(bg=self.current_theme['bg'])
         self.update_theme()
         self.save_theme()
         logger.info(f'切换{new_theme}主题')
 
+    @log_operation
     def update_theme(self):
-        """更新主题颜色"""
-        # 更新标题栏
-        self.title_bar.configure(bg=self.current_theme['primary'])
-        for widget in self.title_bar.winfo_children():
-            widget.configure(bg=self.current_theme['primary'])
-        
-        # 更新按钮和输入框的颜色
-        for widget in self.root.winfo_children():
-            if isinstance(widget, tk.Frame):
-                widget.configure(bg=self.current_theme['bg'])
-                for child in widget.winfo_children():
-                    if isinstance(child, (tk.Button, tk.Radiobutton, tk.Checkbutton)):
-                        child.configure(bg=self.current_theme['bg'], 
-                                     fg=self.current_theme['fg'])
-        
-        # 更新日期标签颜色
-        if hasattr(self, 'date_label'):
-            self.date_label.configure(bg=self.current_theme['bg'],
-                                    fg=self.current_theme['fg'])
-        
-        # 更新列表样式
-        style = ttk.Style()
-        style.configure('Goal.TCheckbutton', 
-                       background='white',
-                       font=('微软雅黑', 11))
-        
-        self.update_list()
+        """更新主题颜色：按注册表一次性重新着色，不销毁或重建任何控件"""
+        self.themes.apply(self.current_theme)
+        if not self.ready:
+            return
+        # 取决于状态的颜色：当前分类按钮、可见行的优先级和完成状态
+        self.update_category_buttons()
+        self.goal_list.apply_theme(self.current_theme)
 
     def save_theme(self):
         """保存主题设置"""
-        with open('settings.json', 'w') as f:
-            json.dump({'theme': 'dark' if self.current_theme == Theme.DARK else 'light'}, f)
+        self.settings['theme'] = 'dark' if self.current_theme == Theme.DARK else 'light'
+        with open('settings.json', 'w', encoding='utf-8') as f:
+            json.dump(self.settings, f, ensure_ascii=False)
 
     def load_theme(self):
         """加载主题设置"""
@@ -902,14 +3391,9 @@ class GoalTracker:
             pass
 
     def on_mouse_move(self, event):
-        """鼠标移动事件处理"""
-        self.last_activity_time = time.time()
-        if self.drag_data['dragging']:
-            x = self.root.winfo_x() - self.drag_data['x'] + event.x
-            y = self.root.winfo_y() - self.drag_data['y'] + event.y
-            self.root.geometry(f"+{x}+{y}")
-            self.drag_data['x'] = event.x
-            self.drag_data['y'] = event.y
+        """鼠标移动事件处理（拖动时与 on_drag 合并为同一次窗口移动）"""
+        self.reset_activity_timer()
+        self.on_drag(event)
 
     def get_date_range(self):
         """获取当前分类的日期范围"""
@@ -930,26 +3414,87 @@ class GoalTracker:
                 last_day = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
             return f"本月 ({first_day.strftime('%Y-%m-%d')}至{last_day.strftime('%Y-%m-%d')})"
             
-        else:  # yearly
+        elif self.current_category == 'yearly':
             # 获取本年的开始和结束日期
             first_day = today.replace(month=1, day=1)
             last_day = today.replace(month=12, day=31)
             return f"本年 ({first_day.strftime('%Y-%m-%d')}至{last_day.strftime('%Y-%m-%d')})"
 
+        else:
+            # 用户新建的列表没有日期范围
+            return self.category_label(self.current_category)
+
     def update_date_range(self):
         """更新日期范围显示"""
         if hasattr(self, 'date_label'):
             self.date_label.config(text=self.get_date_range())
 
+    def create_category_buttons(self):
+        """按列表顺序创建分类按钮（每行 4 个），最后是新建列表的按钮"""
+        for widget in self.category_container.winfo_children():
+            widget.destroy()
+        self.category_buttons.clear()
+        # 统一的按钮样式
+        button_style = {
+            'font': ('微软雅黑', 10),
+            'width': 8,  # 统一宽度
+            'height': 1,
+            'bd': 0,
+            'cursor': 'hand2',
+            'relief': 'flat'
+        }
+        categories = self.storage.category_names(self.goals)
+        for i, category in enumerate(categories):
+            button = tk.Button(self.category_container, text=self.category_label(category),
+                               command=lambda c=category: self.switch_category(c), **button_style)
+            button.grid(row=i // 4, column=i % 4, padx=2, pady=1)
+            if category not in PERIOD_CATEGORIES:
+                button.bind('<Button-3>', lambda e, c=category: self.show_category_menu(e, c))
+            self.category_buttons[category] = button
+        add_button = tk.Button(self.category_container, text='＋', command=self.new_category,
+                               **dict(button_style, width=3))
+        self.themes.register(add_button, bg='secondary_bg', fg='fg')
+        add_button.grid(row=len(categories) // 4, column=len(categories) % 4, padx=2, pady=1)
+        # 更新分类按钮状态
+        self.update_category_buttons()
+
+    def category_label(self, category):
+        """列表的显示名：内置的本周/本月/本年随界面语言变化，用户新建的列表显示其名称"""
+        if category in PERIOD_CATEGORIES:
+            return self.lang.get_text(category)
+        return category
+
+    def show_category_menu(self, event, category):
+        """显示用户列表按钮的右键菜单"""
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label="删除列表", command=lambda: self.delete_category(category))
+        menu.post(event.x_root, event.y_root)
+
+    @log_operation
+    def new_category(self):
+        """新建一个列表并切换过去"""
+        self.reset_activity_timer()
+        name = simpledialog.askstring("新建列表", "列表名称:", parent=self.root)
+        name = (name or '').strip()
+        if not name:
+            return
+        if name in self.storage.category_names(self.goals) or name in PERIOD_CATEGORIES:
+            messagebox.showwarning("提示", f"列表“{name}”已存在")
+            return
+        self.model.add_category(name)
+        self.switch_category(name)
+        logger.info(f'新建列表: {name}')
+
+    def delete_category(self, category):
+        """删除用户列表及其中的目标"""
+        self.reset_activity_timer()
+        if messagebox.askyesno("确认删除", f"确定要删除列表“{category}”及其中的所有目标吗？"):
+            self.model.remove_category(category)
+            logger.info(f'删除列表: {category}')
+
     def update_category_buttons(self):
         """更新分类按钮状态"""
-        buttons = {
-            'weekly': self.weekly_btn,
-            'monthly': self.monthly_btn,
-            'yearly': self.yearly_btn
-        }
-        
-        for category, button in buttons.items():
+        for category, button in self.category_buttons.items():
             if category == self.current_category:
                 button.configure(
                     bg=self.current_theme['primary'],
@@ -961,21 +3506,185 @@ class GoalTracker:
                     fg=self.current_theme['fg']
                 )
 
+    def rollover_periods(self):
+        """周期结束后把上一周期的目标归档，并在次日零点再次检查"""
+        today = datetime.now()
+        carry_forward = self.settings.get('carry_forward', True)
+        periods = {}
+        for category in self.storage.category_names(self.goals):
+            period = period_of(category, today)
+            last = self.archive.periods.get(category)
+            if period is None or period == last:
+                continue
+            if last is not None:
+                count = self.model.archive_period(category, self.archive, last, carry_forward)
+                logger.info(f'周期结转: [{category}] {last} 归档 {count} 个目标')
+            periods[category] = period
+        if periods:
+            try:
+                self.archive.save_periods(periods)
+            except Exception as e:
+                logger.error(f'保存周期记录失败: {str(e)}')
+        tomorrow = (today + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.rollover_timer = self.scheduler.schedule((tomorrow - today).total_seconds() + 1,
+                                                      self.rollover_periods, 'rollover')
+
+    def show_title_menu(self, event):
+        """显示标题栏右键菜单"""
+        if not self.ready:
+            return
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label="导入目标...", command=self.import_goals)
+        menu.add_command(label="导出目标...", command=self.export_goals)
+        menu.post(event.x_root, event.y_root)
+
+    @log_operation
+    def import_goals(self):
+        """从 CSV 或 JSONL 文件导入目标：逐行校验后加入数据，最后只保存和刷新一次"""
+        self.reset_activity_timer()
+        path = filedialog.askopenfilename(
+            title="导入目标",
+            filetypes=[('CSV / JSONL', '*.csv *.jsonl'), ('所有文件', '*.*')])
+        if not path:
+            return
+        categories = set(self.storage.category_names(self.goals))
+        errors = []
+
+        def valid_rows():
+            for line_number, row in read_goal_rows(path):
+                try:
+                    category, goal = parse_goal_row(row, self.current_category)
+                    if category not in categories:
+                        raise ValueError(f'未知的分类: {category}')
+                except ValueError as e:
+                    errors.append(f'第{line_number}行: {str(e)}')
+                    continue
+                yield category, goal
+
+        try:
+            count = self.model.add_goals(valid_rows())
+        except Exception as e:
+            logger.error(f'导入目标失败: {str(e)}')
+            messagebox.showerror("错误", f"导入目标失败: {str(e)}")
+            return
+        logger.info(f'从 {path} 导入 {count} 个目标，跳过 {len(errors)} 行')
+        for error in errors:
+            logger.warning(f'导入时跳过 {error}')
+        message = f"已导入 {count} 个目标"
+        if errors:
+            message += f"，跳过 {len(errors)} 行：\n" + '\n'.join(errors[:10])
+            if len(errors) > 10:
+                message += '\n...'
+        messagebox.showinfo("导入目标", message)
+
+    @log_operation
+    def export_goals(self):
+        """把所有分类的目标逐行导出为 CSV 或 JSONL 文件"""
+        self.reset_activity_timer()
+        path = filedialog.asksaveasfilename(
+            title="导出目标",
+            defaultextension='.csv',
+            filetypes=[('CSV', '*.csv'), ('JSONL', '*.jsonl')])
+        if not path:
+            return
+        rows = ((category, goal)
+                for category in self.storage.category_names(self.goals)
+                for goal in self.goals[category])
+        try:
+            count = write_goal_rows(path, rows)
+        except Exception as e:
+            logger.error(f'导出目标失败: {str(e)}')
+            messagebox.showerror("错误", f"导出目标失败: {str(e)}")
+            return
+        logger.info(f'导出 {count} 个目标到 {path}')
+        messagebox.showinfo("导出目标", f"已导出 {count} 个目标")
+
+    def show_history(self, event=None):
+        """浏览当前分类已归档的周期（选中某个周期时才读取它的归档文件）"""
+        if not self.ready:
+            return
+        self.reset_activity_timer()
+        category = self.current_category
+        history_window = tk.Toplevel(self.root)
+        history_window.title('历史目标')
+        history_window.geometry('300x360')
+        history_window.configure(bg=self.current_theme['bg'])
+        history_window.transient(self.root)
+
+        list_style = {'font': ('微软雅黑', 10), 'bd': 0, 'highlightthickness': 0,
+                      'bg': self.current_theme['secondary_bg'], 'fg': self.current_theme['fg']}
+        periods = self.archive.list_periods(category)
+        period_list = tk.Listbox(history_window, height=6, exportselection=False, **list_style)
+        period_list.pack(fill='x', padx=10, pady=(10, 5))
+        for period in periods:
+            period_list.insert(tk.END, period)
+        if not periods:
+            period_list.insert(tk.END, '暂无历史目标')
+
+        goal_list = tk.Listbox(history_window, **list_style)
+        goal_list.pack(fill='both', expand=True, padx=10, pady=(5, 10))
+
+        def show_period(event):
+            selection = period_list.curselection()
+            if not selection or not periods:
+                return
+            goal_list.delete(0, tk.END)
+            try:
+                goals = [Goal.from_dict(item) for item in self.archive.load(category, periods[selection[0]])]
+            except Exception as e:
+                logger.error(f'读取归档失败: {str(e)}')
+                return
+            for goal in sorted(goals, key=goal_sort_key):
+                mark = '✅' if goal.completed else '⬜'
+                goal_list.insert(tk.END, f"{mark} {PRIORITY_ICONS[goal.priority]} {goal.text}")
+
+        period_list.bind('<<ListboxSelect>>', show_period)
+
     def quit_app(self, event=None):
         """退出应用程序"""
-        self.save_data()
+        self.shutdown()
         self.root.quit()
 
+    def shutdown(self):
+        """退出前的收尾：按设置导出耗时统计，写入尚未落盘的数据并关闭存储（可重复调用）"""
+        if self.is_shut_down:
+            return
+        self.is_shut_down = True
+        if not self.ready:
+            # 数据尚未交给界面线程，没有需要写入的修改
+            return
+        if self.settings.get('latency_report'):
+            self.dump_latency_stats()
+        try:
+            if self.storage.LIVE_RELOAD:
+                # 退出前合并外部修改，避免写入时覆盖它们
+                self.merge_external_changes()
+            self.model.flush()
+        except Exception as e:
+            logger.error(f'数据保存失败: {str(e)}')
+        self.model.close()
+
+    def dump_latency_stats(self, event=None):
+        """把各操作的耗时分位数和当前目标数量写入 latency_stats.json"""
+        report = {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'storage': self.settings.get('storage', 'json'),
+            'goal_counts': {category: self.model.goal_counters(category).total
+                            for category in self.storage.category_names(self.goals)},
+            'startup_ms': self.startup_marks,
+            'operations': {name: histogram.summary()
+                           for name, histogram in operation_latency.items() if histogram.count}
+        }
+        try:
+            with open(self.latency_report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            logger.info(f'耗时统计已导出到 {self.latency_report_file}')
+        except Exception as e:
+            logger.error(f'导出耗时统计失败: {str(e)}')
+
     def get_progress_stats(self):
         """获取目标完成进度统计"""
-        total = len(self.goals[self.current_category])
-        if total == 0:
-            return 0, 0
-        
-        completed = sum(1 for goal in self.goals[self.current_category] if goal['completed'])
-        percentage = (completed / total * 100) if total > 0 else 0
-        
-        return completed, percentage
+        return self.model.progress(self.current_category)
 
     @log_operation
     def add_goal(self):
@@ -989,23 +3698,16 @@ class GoalTracker:
             
         try:
             # 记录添加前的状态
-            logger.info(f'准备添加目标: {text} (优先级: {self.priority_var.get()})')
+            logger.debug(f'准备添加目标: {text} (优先级: {self.priority_var.get()})')
             
             # 添加目标
-            self.goals[self.current_category].append({
-                'text': text,
-                'completed': False,
-                'priority': self.priority_var.get()
-            })
+            goal = Goal(text, False, Priority.parse(self.priority_var.get()))
             
             # 清空输入框
             self.entry.delete(0, tk.END)
             
-            # 保存数据
-            self.save_data()
-            
-            # 更新显示
-            self.update_list()
+            # 保存数据并更新显示（只插入新的一行）
+            self.model.add_goal(self.current_category, goal)
             
             # 记录成功信息
             logger.info(f'添加目标成功: [{self.current_category}] {text} (优先级: {self.priority_var.get()})')
@@ -1016,8 +3718,10 @@ class GoalTracker:
             raise
 
     def reset_activity_timer(self):
-        """重置活动计时器"""
+        """重置活动计时器：只记录时间，空闲截止时间未设定时才设定一次"""
         self.last_activity_time = time.time()
+        if not self.is_minimized and self.idle_timer is None:
+            self.idle_timer = self.scheduler.schedule(self.activity_timeout, self.check_activity, 'idle')
 
     def toggle_language(self, event=None):
         """切换语言"""
@@ -1027,13 +3731,14 @@ class GoalTracker:
 
     def update_ui_text(self):
         """更新界面文本"""
+        if not self.ready:
+            return
         # 更新窗口标题
         self.root.title(self.lang.get_text('app_title'))
         
         # 更新分类按钮
-        self.weekly_btn.config(text=self.lang.get_text('weekly'))
-        self.monthly_btn.config(text=self.lang.get_text('monthly'))
-        self.yearly_btn.config(text=self.lang.get_text('yearly'))
+        for category, button in self.category_buttons.items():
+            button.config(text=self.category_label(category))
         
         # 更新添加按钮
         self.add_btn.config(text=self.lang.get_text('add_button'))
@@ -0,0 +1,106 @@
+"""日志存储的崩溃恢复：写了一半的记录和无法解析的记录不能导致数据丢失"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import BinaryStorage, Goal, GoalModel, JournalStorage  # noqa: E402
+
+
+class JournalRecoveryTest(unittest.TestCase):
+    storage_class = JournalStorage
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'goals.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def journal_path(self):
+        return self.storage_class(self.path).journal_path
+
+    def open_model(self):
+        model = GoalModel(self.storage_class(self.path))
+        model.load()
+        return model
+
+    def texts(self, model):
+        return [goal.text for goal in model.goals['weekly']]
+
+    def crash(self, model):
+        """模拟崩溃：不写快照，只关闭文件句柄"""
+        model.storage._wait_compaction()
+        model.storage._close_journal()
+        if getattr(model.storage, 'map', None) is not None:
+            model.storage._close_map()
+
+    def add_goals(self, model, count, prefix):
+        for i in range(count):
+            model.add_goal('weekly', Goal(f'{prefix}{i}'))
+
+    def test_torn_record_is_truncated_before_appending(self):
+        model = self.open_model()
+        self.add_goals(model, 20, 'a')
+        expected = self.texts(model)
+        self.crash(model)
+        with open(self.journal_path(), 'ab') as f:
+            f.write(b'{"op": "add", "category": "weekly", "goal": {"te')
+
+        model = self.open_model()
+        self.assertEqual(self.texts(model), expected)
+        self.add_goals(model, 4, 'b')
+        expected = self.texts(model)
+        self.crash(model)
+
+        model = self.open_model()
+        self.assertEqual(self.texts(model), expected)
+        model.close()
+
+    def test_undecodable_line_is_skipped(self):
+        model = self.open_model()
+        self.add_goals(model, 10, 'a')
+        self.crash(model)
+        with open(self.journal_path(), 'ab') as f:
+            f.write(b'\xff\xfe not json\n')
+            f.write(b'{"op": "remove", "category": "weekly", "id": 123456789}\n')
+            f.write(b'{"op": "add", "category": "weekly", "goal": 5}\n')
+        model = self.open_model()
+        self.add_goals(model, 10, 'b')
+        expected = self.texts(model)
+        self.crash(model)
+
+        model = self.open_model()
+        self.assertEqual(self.texts(model), expected)
+        self.assertEqual(sum(text.startswith(('a', 'b')) for text in expected), 20)
+        model.close()
+
+
+class BinaryJournalRecoveryTest(JournalRecoveryTest):
+    """二进制快照存储的 goals.bin.journal 使用同一套日志读写"""
+    storage_class = BinaryStorage
+
+    def test_pending_records_of_undecoded_category_survive_torn_tail(self):
+        model = self.open_model()
+        model.add_goal('monthly', Goal('m'))
+        self.add_goals(model, 3, 'a')
+        self.crash(model)
+        with open(self.journal_path(), 'ab') as f:
+            f.write(b'{"op": "upd')
+
+        model = self.open_model()
+        self.assertIn('monthly', model.storage.tables)
+        self.add_goals(model, 2, 'b')
+        self.crash(model)
+
+        model = self.open_model()
+        self.assertEqual([goal.text for goal in model.goals['monthly']], ['m'])
+        self.assertEqual(len(model.goals['weekly']), 4 + 3 + 2)
+        model.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
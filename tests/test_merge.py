@@ -0,0 +1,52 @@
+"""合并外部修改：按 id 对应目标，冲突时保留本程序的版本"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Goal, GoalModel, Priority, diff_goals  # noqa: E402
+
+
+class NullStorage:
+    """不落盘的存储，只提供合并需要的锁"""
+    def __init__(self):
+        self.lock = threading.RLock()
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.model = GoalModel(NullStorage(), persist=lambda op=None: None)
+        self.base = {'weekly': [Goal('a', id=1), Goal('b', id=2), Goal('c', id=3)]}
+        self.model.set_goals({'weekly': [goal.copy() for goal in self.base['weekly']]})
+
+    def theirs(self):
+        return {'weekly': [goal.copy() for goal in self.base['weekly']]}
+
+    def test_external_text_edit_updates_goal_in_place(self):
+        theirs = self.theirs()
+        theirs['weekly'][0].text = 'a2'
+        self.assertEqual(self.model.merge(self.base, theirs), 0)
+        self.assertEqual([(goal.id, goal.text) for goal in self.model.goals['weekly']],
+                         [(1, 'a2'), (2, 'b'), (3, 'c')])
+
+    def test_conflict_keeps_local_version_without_duplicate(self):
+        self.model.update_goal('weekly', self.model.goals['weekly'][0], completed=True)
+        theirs = self.theirs()
+        theirs['weekly'][0].text = 'a2'
+        self.assertEqual(self.model.merge(self.base, theirs), 1)
+        self.assertEqual([(goal.id, goal.text, goal.completed) for goal in self.model.goals['weekly']],
+                         [(1, 'a', True), (2, 'b', False), (3, 'c', False)])
+
+    def test_goals_without_matching_id_fall_back_to_content(self):
+        old = [Goal('a', id=10), Goal('b', id=11)]
+        new = [Goal('a', id=20), Goal('b', True, Priority.HIGH, id=21), Goal('c', id=22)]
+        added, removed, updated = diff_goals(old, new)
+        self.assertEqual([goal.text for goal in added], ['c'])
+        self.assertEqual(removed, [])
+        self.assertEqual(updated, [(old[1], {'completed': True, 'priority': Priority.HIGH})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""语录索引：截断或错位的索引文件在打开时重建"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import QuoteStore  # noqa: E402
+
+
+class QuoteIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'quotes.txt')
+        store = QuoteStore(self.path).open()
+        for i in range(5):
+            store.append(f'quote {i}')
+        self.index_path = store.index_path
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_truncated_or_misaligned_index_is_rebuilt(self):
+        for length in (0, 3, 12, 21):
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(length)
+            store = QuoteStore(self.path).open()
+            self.assertEqual(store.page(0, 10), [f'quote {i}' for i in range(5)])
+
+    def test_append_after_rebuild_is_indexed(self):
+        with open(self.index_path, 'r+b') as f:
+            f.truncate(12)
+        QuoteStore(self.path).open().append('more')
+        store = QuoteStore(self.path).open()
+        self.assertEqual(len(store), 6)
+        self.assertEqual(store.get(5), 'more')
+
+
+if __name__ == '__main__':
+    unittest.main()